@@ -0,0 +1,225 @@
+"""Structured search over the admission selection lists published as PDFs.
+
+The crawler (data/main.py) stores PDF text in ``amjc_pdfs.jsonl``. Selection
+lists such as ``B-COM-LIST-3.pdf`` are tables of application numbers and
+names, which the chunker splits into arbitrary pieces. This module parses
+them into rows of the ``admission_lists`` table (application number, name,
+course, list, shift, ...). Lookups go through an index on the application
+number, so "is AMJ/S1/UG/25-26/4566 selected?" is an exact B-tree lookup
+instead of fuzzy matching.
+
+The table is rebuilt only when the source file or ``PARSER_VERSION`` changes
+(both are recorded in ``snapshot_meta``). To rebuild by hand:
+    python admission_lists.py [--db chatbot.db] [--source data/amjc_data/amjc_pdfs.jsonl]
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sqlite3
+
+PDFS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'amjc_data', 'amjc_pdfs.jsonl')
+META_KEY = 'admission_lists'
+# Part of the stored digest: bump when parsing changes so existing tables are rebuilt
+PARSER_VERSION = 2
+
+# e.g. AMJ/S1/UG/25-26/4566; spaces around separators are tolerated in queries
+APPLICATION_NUMBER = re.compile(
+    r'\bAMJ\s*/\s*S\s*([12])\s*/\s*(UG|PG)\s*/\s*(\d{2})\s*-\s*(\d{2})\s*/\s*(\d{1,6})\b', re.I)
+ROW = re.compile(r'^(\d+)\s+(LATE\s+)?(AMJ/S\d/(?:UG|PG)/\d{2}-\d{2}/\d+)\s+(.+?)\s+([MF])\s+([A-Z]+)\s*$')
+SHIFT = re.compile(r'^SHIFT\s*-\s*([IV]+)\s*$')
+COURSE_LIST = re.compile(r'^(.+?)\s*-\s*SELECTION LIST\s*-\s*([IVX]+)\s*$')
+INTERVIEW = re.compile(r'DATE OF INTERVIEW\s*:\s*(\S+)\s+TIME\s*:\s*(.+?)\s*$')
+
+SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS admission_lists (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        application_number TEXT NOT NULL,
+        name TEXT NOT NULL,
+        gender TEXT,
+        community TEXT,
+        course TEXT,
+        list TEXT,
+        shift TEXT,
+        interview TEXT,
+        late INTEGER DEFAULT 0,
+        source_url TEXT
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_admission_lists_application_number ON admission_lists (application_number)',
+)
+COLUMNS = ('application_number', 'name', 'gender', 'community', 'course', 'list', 'shift',
+           'interview', 'late', 'source_url')
+
+
+def normalize_application_number(match):
+    shift, level, start, end, number = match.groups()
+    return f"AMJ/S{shift}/{level.upper()}/{start}-{end}/{number.zfill(4)}"
+
+
+def find_application_numbers(text):
+    """Normalised application numbers mentioned in ``text`` (in order, without duplicates)."""
+    return list(dict.fromkeys(normalize_application_number(m) for m in APPLICATION_NUMBER.finditer(text)))
+
+
+def parse_admission_list(doc):
+    """Parse one ``{url, title, content}`` record; returns [] if it is not a selection list."""
+    content = doc.get('content') or ''
+    if 'Application Number' not in content:
+        return []
+    course = list_no = shift = interview = None
+    rows = []
+    for line in content.splitlines():
+        line = line.strip()
+        m = ROW.match(line)
+        if m:
+            _sl_no, late, app_no, name, gender, community = m.groups()
+            # store the same form lookups use (e.g. .../25-26/272 -> .../25-26/0272)
+            number = APPLICATION_NUMBER.fullmatch(app_no)
+            app_no = normalize_application_number(number) if number else app_no.upper()
+            rows.append({
+                'application_number': app_no, 'name': name, 'gender': gender, 'community': community,
+                'late': 1 if late else 0, 'source_url': doc.get('url', ''),
+            })
+            continue
+        # headers are printed after the table in the extracted text, so collect them anywhere
+        if (m := SHIFT.match(line)):
+            shift = m.group(1)
+        elif (m := COURSE_LIST.match(line)):
+            course, list_no = m.group(1).strip(), m.group(2)
+        elif (m := INTERVIEW.search(line)):
+            interview = f"{m.group(1)}, {m.group(2)}"
+    for row in rows:
+        row.update(course=course, list=list_no, shift=shift, interview=interview)
+    return rows
+
+
+def extract_admission_lists(path=PDFS_PATH):
+    rows = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                rows.extend(parse_admission_list(json.loads(line)))
+    return rows
+
+
+def file_digest(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class AdmissionLists:
+    """Application-number lookups against the ``admission_lists`` table.
+
+    ``connect`` returns a new SQLite connection (e.g. ``StudentChatbot.db``).
+    """
+
+    def __init__(self, connect, path=PDFS_PATH):
+        self.connect = connect
+        self.path = path
+
+    def init_table(self):
+        conn = self.connect()
+        try:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            conn.execute('CREATE TABLE IF NOT EXISTS snapshot_meta (key TEXT PRIMARY KEY, value TEXT)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def refresh(self, force=False):
+        """Re-extract the lists if the source file changed; returns the row count written, or None."""
+        if not os.path.exists(self.path):
+            return None
+        digest = f"{PARSER_VERSION}:{file_digest(self.path)}"
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT value FROM snapshot_meta WHERE key = ?', (META_KEY,))
+            row = cur.fetchone()
+            if row and row[0] == digest and not force:
+                return None
+            rows = extract_admission_lists(self.path)
+            # replace the whole table in one transaction so lookups never see a partial list
+            cur.execute('BEGIN IMMEDIATE')
+            # another worker may have rebuilt the table while we waited for the write lock
+            cur.execute('SELECT value FROM snapshot_meta WHERE key = ?', (META_KEY,))
+            row = cur.fetchone()
+            if row and row[0] == digest and not force:
+                conn.rollback()
+                return None
+            cur.execute('DELETE FROM admission_lists')
+            cur.executemany(
+                f'INSERT INTO admission_lists ({", ".join(COLUMNS)}) VALUES ({", ".join("?" * len(COLUMNS))})',
+                [tuple(r[c] for c in COLUMNS) for r in rows])
+            cur.execute('INSERT OR REPLACE INTO snapshot_meta (key, value) VALUES (?, ?)', (META_KEY, digest))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return len(rows)
+
+    def lookup(self, application_number):
+        """All list entries for one normalised application number."""
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            cur.execute(f'SELECT {", ".join(COLUMNS)} FROM admission_lists WHERE application_number = ? ORDER BY id',
+                        (application_number,))
+            return [dict(zip(COLUMNS, r)) for r in cur.fetchall()]
+        finally:
+            conn.close()
+
+    def answer(self, user_message):
+        """HTML answer for messages that mention an application number, else None."""
+        numbers = find_application_numbers(user_message)
+        if not numbers:
+            return None
+        return '<br><br>'.join(self.format_entries(n, self.lookup(n)) for n in numbers)
+
+    @staticmethod
+    def format_entries(application_number, entries):
+        number = html.escape(application_number)
+        if not entries:
+            return (
+                f"I couldn't find application number <b>{number}</b> in the published selection lists. "
+                "Please check the latest lists on the <a href='https://www.amjaincollege.edu.in/admissions/' "
+                "target='_blank'>Admissions page</a> or contact the college office."
+            )
+        lines = []
+        for e in entries:
+            title = os.path.basename(e['source_url']) or 'selection list'
+            line = (
+                f"✅ <b>{number}</b> ({html.escape(e['name'])}) is in the <b>{html.escape(e['course'] or 'course')}</b> "
+                f"selection list {html.escape(e['list'] or '')}"
+                f"{', Shift ' + html.escape(e['shift']) if e['shift'] else ''}"
+                f"{' (late application)' if e['late'] else ''}."
+            )
+            if e['interview']:
+                line += f"<br>Date of interview: {html.escape(e['interview'])}"
+            if e['source_url']:
+                line += f"<br>Source: <a href='{html.escape(e['source_url'])}' target='_blank'>{html.escape(title)}</a>"
+            lines.append(line)
+        return '<br>'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Extract admission selection lists into SQLite')
+    parser.add_argument('--db', default='chatbot.db')
+    parser.add_argument('--source', default=PDFS_PATH)
+    args = parser.parse_args(argv)
+    lists = AdmissionLists(lambda: sqlite3.connect(args.db), args.source)
+    lists.init_table()
+    print(f"✓ {lists.refresh(force=True)} admission list entries written to {args.db}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,25 +1,30 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 import sqlite3
-import re
 from datetime import datetime
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from difflib import SequenceMatcher
 import os
 import json
 import io
 import csv
+from chunk_index import ChunkIndex
+from session_store import SessionStore
+from payloads import Payload, build_answer_payloads
+from admission_lists import AdmissionLists
+import faq_snapshot
+from matcher import AI_AVAILABLE, MatchEngine, load_model, load_faqs_from_sqlite, is_follow_up, stop_words
 
 # Optional Redis cache
 REDIS_AVAILABLE = False
 redis_client = None
 try:
-    import redis
     REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
-    redis_client = redis.from_url(REDIS_URL)
+    if REDIS_URL.startswith('fakeredis://'):
+        # in-process stand-in (one per worker), used by the load-testing harness
+        import fakeredis
+        redis_client = fakeredis.FakeRedis()
+    else:
+        import redis
+        redis_client = redis.from_url(REDIS_URL)
     redis_client.ping()
     REDIS_AVAILABLE = True
 except Exception:
@@ -35,49 +40,60 @@ try:
 except Exception:
     TRANSLATOR_AVAILABLE = False
 
-# Optional AI embeddings
-AI_AVAILABLE = False
-try:
-    from sentence_transformers import SentenceTransformer, util
-    AI_AVAILABLE = True
-except Exception as e:
-    print(f"AI packages unavailable or failed to load: {e}")
-    AI_AVAILABLE = False
-
 app = Flask(__name__)
 CORS(app)
 
-# NLTK setup
-for pkg, path in [("punkt", 'tokenizers/punkt'), ("stopwords", 'corpora/stopwords'), ("wordnet", 'corpora/wordnet')]:
-    try:
-        nltk.data.find(path)
-    except LookupError:
-        nltk.download(pkg)
-
-lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words('english'))
+FALLBACK_ANSWER = (
+    "I couldn't find an exact match. Please check 👉 <a href='https://www.amjaincollege.edu.in/' target='_blank'>AM Jain College Website</a> or contact 044-26630520."
+)
+# Fixes applied to existing FAQ rows whose question matches ``question_like``.
+# They are part of the seed version, so editing one re-applies it on startup.
+CONTENT_UPDATES = [
+    {
+        'question_like': '%entrance%',
+        'answer': (
+            "Entrance exam requirements depend on the specific program:"
+            "<ul>"
+            "<li>Some courses may require entrance exams</li>"
+            "<li>Others may have merit-based admission</li>"
+            "<li>Certain programs follow University of Madras guidelines</li>"
+            "</ul>"
+            "For accurate information about your chosen course:<br>"
+            "Shift I: <a href='tel:+914446622216'>044-46622216</a> • "
+            "<a href='mailto:shift1@amjaincollege.edu.in'>shift1@amjaincollege.edu.in</a><br>"
+            "Shift II: <a href='tel:+914446622211'>044-46622211</a> • "
+            "<a href='mailto:shift2@amjaincollege.edu.in'>shift2@amjaincollege.edu.in</a><br>"
+            "See also: <a href='https://www.amjaincollege.edu.in/admissions/' target='_blank'>Admissions page</a>."
+        ),
+        'category': 'admissions',
+        'keywords': "entrance exam requirement merit-based university of madras guidelines admission",
+    },
+]
+EMPTY_MESSAGE_PAYLOAD = Payload({'response': 'Please type a message.'}, 'Please type a message.')
 
 
 class StudentChatbot:
+    db_path = 'chatbot.db'
+
     def __init__(self):
-        self.model = None
-        if AI_AVAILABLE:
-            try:
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
-                print("✓ Embedding model loaded")
-            except Exception as e:
-                print(f"⚠ Could not load embedding model: {e}")
-                self.model = None
-        self.faq_embeddings = None
+        self.model = load_model()
         self.knowledge_base = []
+        self.engine = MatchEngine([], self.model)
+        self.payloads = {}
 
         self.init_database()
         self.populate_default_faqs()
-        self.apply_content_updates()
         self.load_knowledge_base()
 
+        # Selection lists parsed from the crawled PDFs (rebuilt when the source changes)
+        self.admission_lists = AdmissionLists(self.db)
+        self.admission_lists.init_table()
+        count = self.admission_lists.refresh()
+        if count is not None:
+            print(f"✓ Indexed {count} admission list entries")
+
     def db(self):
-        return sqlite3.connect('chatbot.db')
+        return sqlite3.connect(self.db_path)
 
     def init_database(self):
         conn = self.db()
@@ -107,13 +123,12 @@ class StudentChatbot:
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
             )'''
         )
+        # last applied seed version per snapshot key (see faq_snapshot.seed_faqs)
+        cur.execute('CREATE TABLE IF NOT EXISTS snapshot_meta (key TEXT PRIMARY KEY, value TEXT)')
         conn.commit()
         conn.close()
 
     def populate_default_faqs(self):
-        conn = self.db()
-        cur = conn.cursor()
-
         default_faqs = [
             {
                 "question": "What is Agurchand Manmull Jain College?",
@@ -312,17 +327,14 @@ class StudentChatbot:
             },
         ]
 
-        # Insert each FAQ if not already present (idempotent seeding)
-        for faq in default_faqs:
-            cur.execute('SELECT COUNT(*) FROM faqs WHERE question = ?', (faq['question'],))
-            exists = cur.fetchone()[0]
-            if not exists:
-                cur.execute(
-                    'INSERT INTO faqs (question, answer, category, keywords) VALUES (?, ?, ?, ?)',
-                    (faq['question'], faq['answer'], faq.get('category', ''), faq.get('keywords', ''))
-                )
-        conn.commit()
-        conn.close()
+        # Insert missing FAQs and apply content fixes, only when the seed changed
+        conn = self.db()
+        try:
+            if faq_snapshot.seed_faqs(conn, default_faqs, extra=self.apply_content_updates,
+                                      extra_data=CONTENT_UPDATES):
+                print("✓ Default FAQs seeded")
+        finally:
+            conn.close()
 
     # Admin CRUD helpers
     def add_faq(self, question, answer, category='', keywords=''):
@@ -348,125 +360,174 @@ class StudentChatbot:
         conn.commit()
         conn.close()
 
-    def apply_content_updates(self):
-        """Apply idempotent content fixes/updates to existing FAQs in the DB."""
+    def list_faqs(self):
+        conn = self.db()
+        cur = conn.cursor()
+        cur.execute('SELECT id, question, answer, category, keywords FROM faqs')
+        rows = cur.fetchall()
+        conn.close()
+        return [{'id': r[0], 'question': r[1], 'answer': r[2], 'category': r[3], 'keywords': r[4]} for r in rows]
+
+    def export_faqs(self):
+        conn = self.db()
+        try:
+            return faq_snapshot.export_faqs(conn)
+        finally:
+            conn.close()
+
+    def import_faqs(self, faqs, replace=False):
+        """Upsert a snapshot's FAQs in one transaction and reload the indexes."""
+        conn = self.db()
+        try:
+            counts = faq_snapshot.import_faqs(conn, faqs, replace=replace)
+        finally:
+            conn.close()
+        self.load_knowledge_base()
+        return counts
+
+    def record_vote(self, faq_id, helpful):
+        conn = self.db()
+        cur = conn.cursor()
+        cur.execute('INSERT INTO votes (faq_id, helpful) VALUES (?, ?)', (faq_id, 1 if helpful else 0))
+        conn.commit()
+        conn.close()
+
+    def log_conversation(self, user_msg, bot_resp):
         conn = self.db()
         cur = conn.cursor()
-        new_answer = (
-            "Entrance exam requirements depend on the specific program:"
-            "<ul>"
-            "<li>Some courses may require entrance exams</li>"
-            "<li>Others may have merit-based admission</li>"
-            "<li>Certain programs follow University of Madras guidelines</li>"
-            "</ul>"
-            "For accurate information about your chosen course:<br>"
-            "Shift I: <a href='tel:+914446622216'>044-46622216</a> • "
-            "<a href='mailto:shift1@amjaincollege.edu.in'>shift1@amjaincollege.edu.in</a><br>"
-            "Shift II: <a href='tel:+914446622211'>044-46622211</a> • "
-            "<a href='mailto:shift2@amjaincollege.edu.in'>shift2@amjaincollege.edu.in</a><br>"
-            "See also: <a href='https://www.amjaincollege.edu.in/admissions/' target='_blank'>Admissions page</a>."
-        )
-        new_keywords = "entrance exam requirement merit-based university of madras guidelines admission"
         cur.execute(
-            "UPDATE faqs SET answer = ?, category = 'admissions', keywords = ? WHERE lower(question) LIKE '%entrance%'",
-            (new_answer, new_keywords)
+            'INSERT INTO conversations (student_message, bot_response, timestamp) VALUES (?, ?, ?)',
+            (user_msg, bot_resp, datetime.now().isoformat(timespec='seconds'))
         )
         conn.commit()
         conn.close()
 
-    def load_knowledge_base(self):
+    def conversations_csv(self):
+        """Return the conversation history as UTF-8 encoded CSV bytes (newest first)."""
         conn = self.db()
         cur = conn.cursor()
-        cur.execute('SELECT id, question, answer, category, keywords FROM faqs')
-        self.knowledge_base = cur.fetchall()
+        cur.execute('SELECT student_message, bot_response, timestamp FROM conversations ORDER BY id DESC')
+        rows = cur.fetchall()
         conn.close()
 
-        if AI_AVAILABLE and self.model and self.knowledge_base:
-            try:
-                texts = [q + ' ' + (k or '') for _id, q, a, c, k in self.knowledge_base]
-                self.faq_embeddings = self.model.encode(texts, convert_to_tensor=True)
-                print(f"✓ Created embeddings for {len(texts)} FAQs")
-            except Exception as e:
-                print(f"⚠ Embeddings disabled due to error: {e}")
-                self.faq_embeddings = None
-
-    def preprocess(self, text: str):
-        text = text.lower()
-        text = re.sub(r'[^a-z0-9\s]', ' ', text)
-        tokens = [lemmatizer.lemmatize(t) for t in word_tokenize(text) if t not in stop_words]
-        return tokens
-
-    def apply_synonyms(self, text: str):
-        # simple synonyms mapping to broaden matching
-        synonyms = {
-            'fee': 'fees',
-            'tuition': 'fees',
-            'placement': 'placements',
-            'salary': 'placements',
-            'admission': 'admissions',
-            'apply': 'admissions'
-        }
-        words = text.split()
-        words = [synonyms.get(w, w) for w in words]
-        return ' '.join(words)
-
-    def keyword_match_score(self, q_tokens, u_tokens, q_text, u_text):
-        overlap = len(set(q_tokens) & set(u_tokens))
-        substr = 1 if any(t in q_text for t in u_tokens if len(t) > 3) else 0
-        fuzzy = SequenceMatcher(None, q_text, u_text).ratio()
-        score = overlap * 0.4 + substr * 0.2 + fuzzy * 0.6
-        return min(score, 1.0)
-
-    def find_best_match(self, user_message: str):
-        user_text = user_message.strip()
-        if not user_text:
-            return None, 0.0
-
-        # apply simple synonyms normalization
-        user_text = self.apply_synonyms(user_text)
-
-        # Try embeddings first
-        if AI_AVAILABLE and self.model and self.faq_embeddings is not None:
-            try:
-                emb = self.model.encode([user_text], convert_to_tensor=True)
-                sims = util.cos_sim(emb, self.faq_embeddings)[0]
-                best_idx = int(sims.argmax())
-                best_score = float(sims[best_idx])
-                return self.knowledge_base[best_idx], best_score
-            except Exception as e:
-                print(f"⚠ Embedding match failed: {e}")
-
-        # Fallback: keyword/fuzzy
-        u_tokens = self.preprocess(user_text)
-        u_text = ' '.join(u_tokens)
-        best = None
-        best_score = 0.0
-        for i, row in enumerate(self.knowledge_base):
-            # row: (id, question, answer, category, keywords)
-            fid, q, a, c, k = row
-            q_tokens = self.preprocess(q + ' ' + (k or ''))
-            q_text = ' '.join(q_tokens)
-            # consider synonyms in FAQ text as well
-            q_text = self.apply_synonyms(q_text)
-            score = self.keyword_match_score(q_tokens, u_tokens, q_text, u_text)
-            if score > best_score:
-                best_score = score
-                best = row
-        return best, best_score
-
-    def get_response(self, user_message: str):
-        match, score = self.find_best_match(user_message)
-        threshold = 0.48 if (self.faq_embeddings is None) else 0.40
-        if not match or score < threshold:
-            fallback = (
-                "I couldn't find an exact match. Please check 👉 <a href='https://www.amjaincollege.edu.in/' target='_blank'>AM Jain College Website</a> or contact 044-26630520."
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['student_message', 'bot_response', 'timestamp'])
+        for r in rows:
+            writer.writerow(r)
+        return output.getvalue().encode('utf-8')
+
+    def apply_content_updates(self, cur):
+        """Apply ``CONTENT_UPDATES`` to existing FAQs.
+
+        Runs inside the seed transaction, i.e. when ``default_faqs`` or
+        ``CONTENT_UPDATES`` changes.
+        """
+        for fix in CONTENT_UPDATES:
+            cur.execute(
+                "UPDATE faqs SET answer = ?, category = ?, keywords = ? WHERE lower(question) LIKE ?",
+                (fix['answer'], fix['category'], fix['keywords'], fix['question_like'])
             )
-            return fallback, None
+
+    def load_knowledge_base(self):
+        self.knowledge_base = load_faqs_from_sqlite(self.db_path)
+        self.build_indexes()
+
+    def build_indexes(self):
+        """Build the matching engine for the current knowledge base.
+
+        Everything the per-query path needs is computed here, so with a preloaded
+        gunicorn master (see gunicorn.conf.py) workers inherit it copy-on-write
+        instead of rebuilding it per process or per query. The engine is swapped
+        in one assignment, so requests in flight keep a consistent index.
+        Response payloads (see payloads.py) are built first, so every FAQ the
+        new engine can return already has one.
+        """
+        self.payloads = build_answer_payloads(self.knowledge_base, previous=self.payloads,
+                                              extra={None: FALLBACK_ANSWER})
+        self.engine = MatchEngine(self.knowledge_base, self.model)
+
+    def payload_for(self, faq_id, answer):
+        """Precomputed payload for ``faq_id`` if ``answer`` is its stored HTML, else a one-off payload."""
+        payload = self.payloads.get(faq_id)
+        if payload is not None and payload.html == answer:
+            return payload
+        return Payload.dynamic({'response': answer, 'faq_id': faq_id}, answer)
+
+    def answer_event(self, faq_id, answer):
+        """The /chat/stream ``answer`` event, pre-serialised when ``answer`` is the stored HTML."""
+        payload = self.payloads.get(faq_id)
+        if payload is not None and payload.html == answer:
+            return payload.answer_event
+        return sse_event('answer', {'response': answer, 'faq_id': faq_id})
+
+    def find_best_match(self, user_message: str, context=None):
+        match, score, _emb = self.engine.match(user_message, context)
+        return match, score
+
+    def remember(self, context, faq_id, query_embedding=None):
+        """Record the matched FAQ (and its category) as the session's active topic."""
+        row = self.engine.row_by_id.get(faq_id)
+        if row is None:
+            return
+        context['faq_id'] = faq_id
+        context['category'] = row[3]
+        context['embedding'] = query_embedding.tolist() if query_embedding is not None else None
+
+    def get_response(self, user_message: str, context=None):
+        """Return ``(answer_html, faq_id)``; ``context`` is updated in place when given."""
+        # application-number lookups are answered from the admission-list index, not the FAQs
+        admission_answer = self.admission_lists.answer(user_message)
+        if admission_answer is not None:
+            return admission_answer, None
+
+        engine = self.engine
+        match, score, emb = engine.match(user_message, context)
+        threshold = engine.threshold()
+        if not match or score < threshold:
+            return FALLBACK_ANSWER, None
+        if context is not None:
+            self.remember(context, match[0], emb)
         # match is row: (id, question, answer, category, keywords)
         return match[2], match[0]
 
 
 bot = StudentChatbot()
+chunk_index = ChunkIndex(stop_words=stop_words)
+sessions = SessionStore(redis_client if REDIS_AVAILABLE else None,
+                        ttl=int(os.environ.get('SESSION_TTL', 1800)))
+
+CHAT_CACHE_TTL = 300
+SNIPPET_COUNT = 3
+
+
+def chat_cache_key(user_msg: str, context=None, lang='en'):
+    # follow-ups depend on the session's active category, and cached entries
+    # hold the translated response, so both are part of the key
+    prefix = 'chat:' if not lang or lang == 'en' else f'chat:{lang}:'
+    if context and context.get('category') and is_follow_up(user_msg):
+        return f"{prefix}{context['category']}:{user_msg}"
+    return f"{prefix}{user_msg}"
+
+
+def translate_text(text: str, lang: str):
+    """Best-effort translation; returns the original text when unavailable or on error."""
+    if TRANSLATOR_AVAILABLE and lang and lang != 'en' and text:
+        try:
+            return translator.translate(text, dest=lang).text
+        except Exception:
+            pass
+    return text
+
+
+def payload_response(payload):
+    body, headers = payload.select(request.headers.get('Accept-Encoding'))
+    return Response(body, headers=headers)
+
+
+def sse_event(event: str, data):
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 
 @app.route('/')
@@ -489,12 +550,7 @@ def admin_panel():
 @app.route('/api/faqs', methods=['GET', 'POST'])
 def api_faqs():
     if request.method == 'GET':
-        conn = bot.db()
-        cur = conn.cursor()
-        cur.execute('SELECT id, question, answer, category, keywords FROM faqs')
-        rows = cur.fetchall()
-        conn.close()
-        return jsonify([{'id': r[0], 'question': r[1], 'answer': r[2], 'category': r[3], 'keywords': r[4]} for r in rows])
+        return jsonify(bot.list_faqs())
 
     data = request.get_json(force=True)
     q = data.get('question')
@@ -519,35 +575,38 @@ def api_faq_modify(faq_id):
     return jsonify({'status': 'updated'})
 
 
+@app.route('/api/faqs/export')
+def api_faqs_export():
+    fmt = request.args.get('format', 'json')
+    if fmt not in ('json', 'yaml'):
+        return jsonify({'error': 'format must be json or yaml'}), 400
+    body = faq_snapshot.dump_snapshot(bot.export_faqs(), fmt)
+    mimetype = 'application/x-yaml' if fmt == 'yaml' else 'application/json'
+    return Response(body, mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename=faqs.{"yml" if fmt == "yaml" else "json"}'})
+
+
+@app.route('/api/faqs/import', methods=['POST'])
+def api_faqs_import():
+    fmt = 'yaml' if 'yaml' in (request.content_type or '') else 'json'
+    try:
+        faqs = faq_snapshot.parse_snapshot(request.get_data(as_text=True), fmt)
+    except Exception as e:
+        return jsonify({'error': f'invalid snapshot: {e}'}), 400
+    counts = bot.import_faqs(faqs, replace=request.args.get('mode') == 'replace')
+    return jsonify({'status': 'ok', **counts})
+
+
 @app.route('/api/vote', methods=['POST'])
 def api_vote():
     data = request.get_json(force=True)
-    faq_id = data.get('faq_id')
-    helpful = 1 if data.get('helpful') else 0
-    conn = bot.db()
-    cur = conn.cursor()
-    cur.execute('INSERT INTO votes (faq_id, helpful) VALUES (?, ?)', (faq_id, helpful))
-    conn.commit()
-    conn.close()
+    bot.record_vote(data.get('faq_id'), data.get('helpful'))
     return jsonify({'status': 'ok'})
 
 
 @app.route('/export/csv')
 def export_csv():
-    conn = bot.db()
-    cur = conn.cursor()
-    cur.execute('SELECT student_message, bot_response, timestamp FROM conversations ORDER BY id DESC')
-    rows = cur.fetchall()
-    conn.close()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['student_message', 'bot_response', 'timestamp'])
-    for r in rows:
-        writer.writerow(r)
-    output.seek(0)
-
-    return send_file(io.BytesIO(output.getvalue().encode('utf-8')), mimetype='text/csv', as_attachment=True, download_name='chat_history.csv')
+    return send_file(io.BytesIO(bot.conversations_csv()), mimetype='text/csv', as_attachment=True, download_name='chat_history.csv')
 
 
 # PDF export removed - only CSV export is supported
@@ -558,45 +617,96 @@ def chat():
     data = request.get_json(force=True)
     user_msg = (data.get('message') or '').strip()
     lang = data.get('lang', 'en')
+    session_id = data.get('session_id')
     if not user_msg:
-        return jsonify({"response": "Please type a message."})
+        return payload_response(EMPTY_MESSAGE_PAYLOAD)
+
+    context = sessions.get(session_id)
 
     # check cache
-    cache_key = f"chat:{user_msg}" if REDIS_AVAILABLE else None
+    cache_key = chat_cache_key(user_msg, context, lang)
     if REDIS_AVAILABLE and redis_client:
         cached = redis_client.get(cache_key)
         if cached:
             resp = json.loads(cached)
-            return jsonify({'response': resp.get('response')})
+            if resp.get('faq_id'):
+                bot.remember(context, resp['faq_id'])
+                sessions.set(session_id, context)
+            return payload_response(bot.payload_for(resp.get('faq_id'), resp.get('response')))
 
-    bot_resp, faq_id = bot.get_response(user_msg)
+    answer, faq_id = bot.get_response(user_msg, context)
+    sessions.set(session_id, context)
 
     # Translate if requested (best-effort)
-    if TRANSLATOR_AVAILABLE and lang and lang != 'en' and bot_resp:
-        try:
-            trans = translator.translate(bot_resp, dest=lang)
-            bot_resp = trans.text
-        except Exception:
-            pass
+    bot_resp = translate_text(answer, lang)
 
     # store conversation
-    conn = bot.db()
-    cur = conn.cursor()
-    cur.execute(
-        'INSERT INTO conversations (student_message, bot_response, timestamp) VALUES (?, ?, ?)',
-        (user_msg, bot_resp, datetime.now().isoformat(timespec='seconds'))
-    )
-    conn.commit()
-    conn.close()
+    bot.log_conversation(user_msg, bot_resp)
 
-    # cache
+    # cache (``answer`` is the untranslated text the stream sends first)
     if REDIS_AVAILABLE and redis_client:
-        redis_client.set(cache_key, json.dumps({'response': bot_resp}), ex=300)
+        redis_client.set(cache_key, json.dumps({'response': bot_resp, 'answer': answer, 'faq_id': faq_id}),
+                         ex=CHAT_CACHE_TTL)
 
-    return jsonify({"response": bot_resp})
+    # untranslated answers are served from the payloads built with the knowledge base
+    return payload_response(bot.payload_for(faq_id, bot_resp))
 
 
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """Streaming variant of /chat (server-sent events).
 
+    Events, in order: ``answer`` (the matched answer, sent as soon as matching
+    finishes), ``translation`` (only when a non-English ``lang`` is requested),
+    ``snippets`` (supplementary passages from the crawled site) and ``done``.
+    """
+    data = request.get_json(force=True)
+    user_msg = (data.get('message') or '').strip()
+    lang = data.get('lang', 'en')
+    session_id = data.get('session_id')
+
+    def generate():
+        if not user_msg:
+            yield sse_event('answer', {'response': 'Please type a message.', 'faq_id': None})
+            yield sse_event('done', {})
+            return
+
+        context = sessions.get(session_id)
+
+        # same answer cache as /chat
+        cache_key = chat_cache_key(user_msg, context, lang)
+        cached = None
+        if REDIS_AVAILABLE and redis_client:
+            raw = redis_client.get(cache_key)
+            cached = json.loads(raw) if raw else None
+        if cached:
+            faq_id = cached.get('faq_id')
+            if faq_id:
+                bot.remember(context, faq_id)
+                sessions.set(session_id, context)
+            bot_resp = cached.get('answer', cached.get('response'))
+        else:
+            bot_resp, faq_id = bot.get_response(user_msg, context)
+            sessions.set(session_id, context)
+        yield bot.answer_event(faq_id, bot_resp)
+
+        translated = cached.get('response') if cached else translate_text(bot_resp, lang)
+        if translated != bot_resp:
+            yield sse_event('translation', {'response': translated})
+
+        snippets = chunk_index.search(user_msg, k=SNIPPET_COUNT)
+        if snippets:
+            yield sse_event('snippets', {'items': snippets})
+
+        if not cached:
+            bot.log_conversation(user_msg, translated)
+            if REDIS_AVAILABLE and redis_client:
+                redis_client.set(cache_key, json.dumps({'response': translated, 'answer': bot_resp, 'faq_id': faq_id}),
+                                 ex=CHAT_CACHE_TTL)
+        yield sse_event('done', {})
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers=headers)
 
 
 @app.route('/health')
@@ -0,0 +1,278 @@
+"""ASGI entry point for the chatbot API.
+
+Exposes the same JSON routes as app.py (``/chat``, ``/chat/stream``,
+``/api/faqs``, ``/api/faqs/export``, ``/api/faqs/import``, ``/api/vote``,
+``/export/csv``, ``/health``) on Starlette. I/O-bound steps (Redis cache,
+translation, SQLite logging) are awaited so a slow round-trip no longer blocks
+the worker, and CPU-bound matching runs in a bounded thread pool
+(``MATCH_WORKERS``, default: CPU count).
+
+The knowledge base, database schema and optional integrations are shared with
+app.py, so both entry points serve the same answers.
+
+Run with:
+    pip install -r requirements-asgi.txt
+    uvicorn asgi_app:app --host 0.0.0.0 --port 8000
+    gunicorn asgi_app:app -k uvicorn.workers.UvicornWorker
+"""
+import asyncio
+import contextlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+import app as chatbot_app
+import faq_snapshot
+from app import bot, chunk_index, sessions, chat_cache_key, sse_event, CHAT_CACHE_TTL, SNIPPET_COUNT, EMPTY_MESSAGE_PAYLOAD
+
+MATCH_WORKERS = int(os.environ.get('MATCH_WORKERS', os.cpu_count() or 2))
+match_executor = ThreadPoolExecutor(max_workers=MATCH_WORKERS, thread_name_prefix='match')
+
+# Async Redis client mirroring the sync one configured in app.py
+async_redis = None
+if chatbot_app.REDIS_AVAILABLE:
+    try:
+        if chatbot_app.REDIS_URL.startswith('fakeredis://'):
+            from fakeredis import aioredis
+            async_redis = aioredis.FakeRedis()
+        else:
+            import redis.asyncio as aioredis
+            async_redis = aioredis.from_url(chatbot_app.REDIS_URL)
+    except Exception as e:
+        print(f"⚠ Async Redis unavailable, caching disabled: {e}")
+        async_redis = None
+
+
+async def run_cpu(func, *args):
+    """Run a CPU-bound callable in the bounded matching pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(match_executor, func, *args)
+
+
+async def translate_text(text: str, lang: str):
+    if not (chatbot_app.TRANSLATOR_AVAILABLE and lang and lang != 'en' and text):
+        return text
+    translate = chatbot_app.translator.translate
+    try:
+        if asyncio.iscoroutinefunction(translate):
+            trans = await translate(text, dest=lang)
+        else:
+            trans = await asyncio.to_thread(translate, text, dest=lang)
+        return trans.text
+    except Exception:
+        return text
+
+
+async def read_json(request):
+    # mirror Flask's get_json(force=True): ignore the content type, 400 on malformed JSON
+    try:
+        return json.loads(await request.body() or b'{}')
+    except ValueError:
+        raise HTTPException(status_code=400, detail='invalid JSON body')
+
+
+async def http_error(request, exc):
+    return JSONResponse({'error': exc.detail}, status_code=exc.status_code)
+
+
+def payload_response(request, payload):
+    body, headers = payload.select(request.headers.get('accept-encoding'))
+    return Response(body, headers=headers)
+
+
+async def chat(request):
+    data = await read_json(request)
+    user_msg = (data.get('message') or '').strip()
+    lang = data.get('lang', 'en')
+    session_id = data.get('session_id')
+    if not user_msg:
+        return payload_response(request, EMPTY_MESSAGE_PAYLOAD)
+
+    context = await asyncio.to_thread(sessions.get, session_id)
+
+    # check cache
+    cache_key = chat_cache_key(user_msg, context, lang)
+    if async_redis:
+        try:
+            cached = await async_redis.get(cache_key)
+        except Exception:
+            cached = None
+        if cached:
+            resp = json.loads(cached)
+            if resp.get('faq_id'):
+                bot.remember(context, resp['faq_id'])
+                await asyncio.to_thread(sessions.set, session_id, context)
+            return payload_response(request, bot.payload_for(resp.get('faq_id'), resp.get('response')))
+
+    answer, faq_id = await run_cpu(bot.get_response, user_msg, context)
+    await asyncio.to_thread(sessions.set, session_id, context)
+
+    # Translate if requested (best-effort)
+    bot_resp = await translate_text(answer, lang)
+
+    # store conversation
+    await asyncio.to_thread(bot.log_conversation, user_msg, bot_resp)
+
+    # cache
+    if async_redis:
+        try:
+            await async_redis.set(cache_key, json.dumps({'response': bot_resp, 'answer': answer, 'faq_id': faq_id}),
+                                  ex=CHAT_CACHE_TTL)
+        except Exception:
+            pass
+
+    return payload_response(request, bot.payload_for(faq_id, bot_resp))
+
+
+async def chat_stream(request):
+    """Server-sent-events variant of /chat; same events as app.chat_stream."""
+    data = await read_json(request)
+    user_msg = (data.get('message') or '').strip()
+    lang = data.get('lang', 'en')
+    session_id = data.get('session_id')
+
+    async def generate():
+        if not user_msg:
+            yield sse_event('answer', {'response': 'Please type a message.', 'faq_id': None})
+            yield sse_event('done', {})
+            return
+
+        context = await asyncio.to_thread(sessions.get, session_id)
+
+        # same answer cache as /chat
+        cache_key = chat_cache_key(user_msg, context, lang)
+        cached = None
+        if async_redis:
+            try:
+                raw = await async_redis.get(cache_key)
+                cached = json.loads(raw) if raw else None
+            except Exception:
+                cached = None
+        if cached:
+            faq_id = cached.get('faq_id')
+            if faq_id:
+                bot.remember(context, faq_id)
+                await asyncio.to_thread(sessions.set, session_id, context)
+            bot_resp = cached.get('answer', cached.get('response'))
+        else:
+            bot_resp, faq_id = await run_cpu(bot.get_response, user_msg, context)
+            await asyncio.to_thread(sessions.set, session_id, context)
+        yield bot.answer_event(faq_id, bot_resp)
+
+        # retrieval runs while the translation round-trip is in flight
+        snippets_task = asyncio.ensure_future(run_cpu(chunk_index.search, user_msg, SNIPPET_COUNT))
+        translated = cached.get('response') if cached else await translate_text(bot_resp, lang)
+        if translated != bot_resp:
+            yield sse_event('translation', {'response': translated})
+
+        snippets = await snippets_task
+        if snippets:
+            yield sse_event('snippets', {'items': snippets})
+
+        if not cached:
+            await asyncio.to_thread(bot.log_conversation, user_msg, translated)
+            if async_redis:
+                try:
+                    await async_redis.set(cache_key, json.dumps({'response': translated, 'answer': bot_resp,
+                                                                 'faq_id': faq_id}), ex=CHAT_CACHE_TTL)
+                except Exception:
+                    pass
+        yield sse_event('done', {})
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return StreamingResponse(generate(), media_type='text/event-stream', headers=headers)
+
+
+async def api_faqs(request):
+    if request.method == 'GET':
+        return JSONResponse(await asyncio.to_thread(bot.list_faqs))
+
+    data = await read_json(request)
+    await asyncio.to_thread(bot.add_faq, data.get('question'), data.get('answer'),
+                            data.get('category', ''), data.get('keywords', ''))
+    await run_cpu(bot.load_knowledge_base)
+    return JSONResponse({'status': 'ok'})
+
+
+async def api_faq_modify(request):
+    faq_id = request.path_params['faq_id']
+    if request.method == 'DELETE':
+        await asyncio.to_thread(bot.delete_faq, faq_id)
+        await run_cpu(bot.load_knowledge_base)
+        return JSONResponse({'status': 'deleted'})
+
+    data = await read_json(request)
+    await asyncio.to_thread(bot.update_faq, faq_id, data.get('question'), data.get('answer'),
+                            data.get('category', ''), data.get('keywords', ''))
+    await run_cpu(bot.load_knowledge_base)
+    return JSONResponse({'status': 'updated'})
+
+
+async def api_faqs_export(request):
+    fmt = request.query_params.get('format', 'json')
+    if fmt not in ('json', 'yaml'):
+        return JSONResponse({'error': 'format must be json or yaml'}, status_code=400)
+    snapshot = await asyncio.to_thread(bot.export_faqs)
+    media_type = 'application/x-yaml' if fmt == 'yaml' else 'application/json'
+    return Response(faq_snapshot.dump_snapshot(snapshot, fmt), media_type=media_type,
+                    headers={'Content-Disposition': f'attachment; filename=faqs.{"yml" if fmt == "yaml" else "json"}'})
+
+
+async def api_faqs_import(request):
+    fmt = 'yaml' if 'yaml' in request.headers.get('content-type', '') else 'json'
+    try:
+        faqs = faq_snapshot.parse_snapshot((await request.body()).decode('utf-8'), fmt)
+    except Exception as e:
+        return JSONResponse({'error': f'invalid snapshot: {e}'}, status_code=400)
+    counts = await run_cpu(bot.import_faqs, faqs, request.query_params.get('mode') == 'replace')
+    return JSONResponse({'status': 'ok', **counts})
+
+
+async def api_vote(request):
+    data = await read_json(request)
+    await asyncio.to_thread(bot.record_vote, data.get('faq_id'), data.get('helpful'))
+    return JSONResponse({'status': 'ok'})
+
+
+async def export_csv(request):
+    body = await asyncio.to_thread(bot.conversations_csv)
+    return Response(body, media_type='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=chat_history.csv'})
+
+
+async def health(request):
+    return JSONResponse({"status": "ok"})
+
+
+routes = [
+    Route('/chat', chat, methods=['POST']),
+    Route('/chat/stream', chat_stream, methods=['POST']),
+    Route('/api/faqs', api_faqs, methods=['GET', 'POST']),
+    Route('/api/faqs/export', api_faqs_export),
+    Route('/api/faqs/import', api_faqs_import, methods=['POST']),
+    Route('/api/faqs/{faq_id:int}', api_faq_modify, methods=['PUT', 'DELETE']),
+    Route('/api/vote', api_vote, methods=['POST']),
+    Route('/export/csv', export_csv),
+    Route('/health', health),
+]
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app):
+    yield
+    match_executor.shutdown(wait=False)
+
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan,
+    exception_handlers={HTTPException: http_error},
+)
@@ -0,0 +1,392 @@
+"""Reproducible benchmark for the FAQ matching engines.
+
+Replays a deterministic query set against:
+- ``StudentChatbot.find_best_match`` in app.py (embedding and keyword/fuzzy fallback modes)
+- ``find_best_match`` in chatbot_backend.py (YAML knowledge base)
+
+The query set is built from the seeded FAQs (``populate_default_faqs``), the
+entries in ``college_faq.yml`` and perturbed/typo variants of both. Each run
+reports throughput, latency percentiles, memory and top-1 accuracy, and can
+scale the knowledge base synthetically (e.g. 1k / 10k FAQs).
+
+Usage:
+    python benchmarks/bench_matching.py
+    python benchmarks/bench_matching.py --sizes base 1000 10000 --output bench_results.json
+    python benchmarks/bench_matching.py --compare bench_baseline.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import re
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FILLER_PREFIXES = ["tell me about ", "what is the ", "can you share ", "i want to know "]
+FILLER_SUFFIXES = [" please", "?", " details", " info"]
+
+
+# ---------------------------------------------------------------------------
+# Engine loading
+# ---------------------------------------------------------------------------
+
+def load_engines():
+    """Import both services in an isolated working directory.
+
+    chatbot_backend reads ``college_faq.yml`` relative to the cwd, while app.py
+    creates ``chatbot.db`` in the cwd; running app.py from a temp dir gives a
+    freshly seeded database on every run, which keeps results reproducible.
+    """
+    cwd = os.getcwd()
+    try:
+        os.chdir(ROOT)
+        import chatbot_backend
+        os.chdir(tempfile.mkdtemp(prefix='amjc-bench-'))
+        import app
+    finally:
+        os.chdir(cwd)
+    return app, chatbot_backend
+
+
+# ---------------------------------------------------------------------------
+# Query set
+# ---------------------------------------------------------------------------
+
+def typo(text, rng):
+    """Introduce a single deterministic typo (swap, drop or duplicate a char)."""
+    letters = [i for i, ch in enumerate(text) if ch.isalpha()]
+    if len(letters) < 3:
+        return text
+    i = rng.choice(letters[:-1])
+    kind = rng.choice(['swap', 'drop', 'dup'])
+    if kind == 'swap':
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if kind == 'drop':
+        return text[:i] + text[i + 1:]
+    return text[:i] + text[i] + text[i:]
+
+
+def variants(text, rng):
+    """Yield (variant_name, query) pairs for a source question."""
+    yield 'exact', text
+    yield 'lower', re.sub(r'[^a-z0-9\s]', '', text.lower()).strip()
+    yield 'typo', typo(text, rng)
+    yield 'typo2', typo(typo(text, rng), rng)
+    yield 'phrased', rng.choice(FILLER_PREFIXES) + text.lower().rstrip('?') + rng.choice(FILLER_SUFFIXES)
+
+
+def build_queries(seed_rows, yml_rows, seed):
+    """Build the replay set.
+
+    Every query records the FAQ it was derived from so top-1 accuracy can be
+    scored against either knowledge base: ``expected_question`` for the engine
+    the query came from and ``expected_category`` for the other one (the YAML
+    ids line up with the seeded FAQ categories).
+    """
+    rng = random.Random(seed)
+    yml_ids = {cat for _id, _q, _a, cat, _kw in yml_rows}
+    queries = []
+    for _id, q, _a, cat, kw in seed_rows:
+        for name, text in variants(q, rng):
+            queries.append({'text': text, 'source': 'seed', 'variant': name,
+                            'expected_question': q, 'expected_category': cat if cat in yml_ids else None})
+        if kw:
+            queries.append({'text': kw, 'source': 'seed', 'variant': 'keywords',
+                            'expected_question': q, 'expected_category': cat if cat in yml_ids else None})
+    for _id, q, _a, cat, _kw in yml_rows:
+        for name, text in variants(q, rng):
+            queries.append({'text': text, 'source': 'yml', 'variant': name,
+                            'expected_question': q, 'expected_category': cat})
+    return [q for q in queries if q['text'].strip()]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic scaling
+# ---------------------------------------------------------------------------
+
+def vocabulary(texts):
+    words = set()
+    for t in texts:
+        words.update(w for w in re.findall(r'[a-z]{3,}', t.lower()))
+    return sorted(words)
+
+
+def synthetic_rows(base_rows, size, seed):
+    """Pad the knowledge base with deterministic distractor FAQs up to ``size`` rows."""
+    if size <= len(base_rows):
+        return list(base_rows)
+    rng = random.Random(seed)
+    # answers are included so small knowledge bases (e.g. the YAML one) still yield enough words
+    vocab = vocabulary(' '.join((q, k or '', re.sub(r'<[^>]+>', ' ', a or ''))) for _id, q, a, _c, k in base_rows)
+    categories = sorted({c for _id, _q, _a, c, _k in base_rows if c}) or ['general']
+    rows = list(base_rows)
+    next_id = max(r[0] for r in base_rows) + 1
+    while len(rows) < size:
+        question = ' '.join(rng.sample(vocab, min(rng.randint(3, 7), len(vocab)))).capitalize() + '?'
+        keywords = ' '.join(rng.sample(vocab, min(rng.randint(2, 5), len(vocab))))
+        rows.append((next_id, question, f'Synthetic answer {next_id}.', rng.choice(categories), keywords))
+        next_id += 1
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def rss_kb():
+    """Current resident set size in KiB (Linux), falling back to peak RSS."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def run_queries(match_fn, queries, judge, repeat, warmup):
+    """Time ``match_fn`` over ``queries`` and score each top-1 result with ``judge``."""
+    for q in queries[:warmup]:
+        match_fn(q['text'])
+
+    gc.collect()
+    rss_before = rss_kb()
+    latencies = []
+    correct = 0
+    judged = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            t0 = time.perf_counter()
+            result = match_fn(q['text'])
+            latencies.append(time.perf_counter() - t0)
+            verdict = judge(q, result)
+            if verdict is not None:
+                judged += 1
+                correct += int(verdict)
+    elapsed = time.perf_counter() - start
+    rss_after = rss_kb()
+
+    # tracemalloc slows allocation-heavy code several times over, so the peak
+    # is measured in a separate, untimed pass
+    gc.collect()
+    tracemalloc.start()
+    for q in queries:
+        match_fn(q['text'])
+    _cur, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    ms = [x * 1000.0 for x in latencies]
+    return {
+        'queries': len(latencies),
+        'elapsed_s': round(elapsed, 4),
+        'throughput_qps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': round(sum(ms) / len(ms), 3) if ms else 0.0,
+            'p50': round(percentile(ms, 50), 3),
+            'p90': round(percentile(ms, 90), 3),
+            'p99': round(percentile(ms, 99), 3),
+            'max': round(ms[-1], 3) if ms else 0.0,
+        },
+        'memory_kb': {
+            'traced_peak': peak // 1024,
+            'rss': rss_after,
+            'rss_delta': rss_after - rss_before,
+        },
+        'top1_accuracy': round(correct / judged, 4) if judged else None,
+        'judged': judged,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Engines under test
+# ---------------------------------------------------------------------------
+
+def make_student_bot(app, rows, mode, cache):
+    """Build a StudentChatbot over ``rows`` without touching the database."""
+    bot = app.StudentChatbot.__new__(app.StudentChatbot)
+    bot.model = app.bot.model if mode == 'embedding' else None
+    bot.knowledge_base = rows
+    bot.payloads = {}
+    bot.build_indexes()
+    if not cache:
+        bot.engine.cache_size = 0
+    return bot
+
+
+def judge_student(q, result):
+    row, _score = result
+    if row is None:
+        return False
+    if q['source'] == 'seed':
+        return row[1] == q['expected_question']
+    if q['expected_category'] is None:
+        return None
+    return row[3] == q['expected_category']
+
+
+def bench_student(app, queries, rows, mode, args):
+    if mode == 'embedding' and not (app.AI_AVAILABLE and app.bot.model is not None):
+        return {'skipped': 'sentence-transformers model unavailable'}
+    t0 = time.perf_counter()
+    bot = make_student_bot(app, rows, mode, args.cache)
+    build_s = time.perf_counter() - t0
+    result = run_queries(bot.find_best_match, queries, judge_student, args.repeat, args.warmup)
+    result['index_build_s'] = round(build_s, 4)
+
+    # Same queries through the batch API (one encode/scoring pass in embedding mode)
+    texts = [q['text'] for q in queries]
+    t0 = time.perf_counter()
+    bot.engine.match_many(texts)
+    batch_s = time.perf_counter() - t0
+    result['batch_throughput_qps'] = round(len(texts) / batch_s, 2) if batch_s else 0.0
+    return result
+
+
+def bench_backend(backend, queries, size, args):
+    base_rows = backend.engine.rows
+    rows = synthetic_rows(base_rows, size, args.seed)
+    html_to_category = {backend.markdown_like_to_html(a): cat for _id, _q, a, cat, _kw in base_rows}
+
+    def judge(q, html):
+        if q['expected_category'] is None:
+            return None
+        return html_to_category.get(html) == q['expected_category']
+
+    saved = backend.engine, backend.payloads
+    backend.engine = backend.MatchEngine(rows, saved[0].model, cache_size=4096 if args.cache else 0)
+    backend.payloads = backend.build_answer_payloads(rows, backend.markdown_like_to_html,
+                                                     extra={None: backend.FALLBACK_ANSWER})
+    try:
+        return run_queries(backend.find_best_match, queries, judge, args.repeat, args.warmup)
+    finally:
+        backend.engine, backend.payloads = saved
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def result_key(r):
+    return f"{r['engine']}/{r['mode']}/{r['size']}"
+
+
+def compare(current, baseline, tolerance):
+    """Print a per-case comparison and return the number of regressions."""
+    base = {result_key(r): r for r in baseline.get('results', [])}
+    regressions = 0
+    print(f"\n{'case':<40} {'qps':>18} {'p99 ms':>18} {'top1':>14}")
+    for r in current['results']:
+        b = base.get(result_key(r))
+        if not b or 'skipped' in r or 'skipped' in b:
+            continue
+        qps_ratio = r['throughput_qps'] / b['throughput_qps'] if b['throughput_qps'] else 1.0
+        acc_now, acc_then = r['top1_accuracy'] or 0.0, b['top1_accuracy'] or 0.0
+        flag = ''
+        if qps_ratio < 1.0 - tolerance or acc_now < acc_then:
+            regressions += 1
+            flag = '  REGRESSION'
+        print(f"{result_key(r):<40} {b['throughput_qps']:>8} -> {r['throughput_qps']:<8}"
+              f"{b['latency_ms']['p99']:>8} -> {r['latency_ms']['p99']:<8}"
+              f"{acc_then:>6} -> {acc_now:<6}{flag}")
+    return regressions
+
+
+def parse_size(value):
+    return 0 if value == 'base' else int(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['base', '1000', '10000'],
+                        help="knowledge base sizes to test ('base' = unscaled)")
+    parser.add_argument('--engines', nargs='+', default=['embedding', 'fallback', 'backend'],
+                        choices=['embedding', 'fallback', 'backend'])
+    parser.add_argument('--repeat', type=int, default=1, help='passes over the query set')
+    parser.add_argument('--warmup', type=int, default=5, help='untimed queries before each case')
+    parser.add_argument('--scaled-queries', type=int, default=50,
+                        help='queries replayed at synthetic sizes (deterministic sample)')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--cache', action='store_true',
+                        help="keep the engine's query cache on (off by default to time the matching path)")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help='baseline results JSON to diff against')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='allowed relative throughput drop before flagging a regression')
+    args = parser.parse_args(argv)
+
+    app, backend = load_engines()
+    seed_rows = list(app.bot.knowledge_base)
+    yml_rows = backend.engine.rows
+    queries = build_queries(seed_rows, yml_rows, args.seed)
+    print(f"Replaying {len(queries)} queries ({len(seed_rows)} seeded FAQs, {len(yml_rows)} YAML FAQs)")
+
+    results = []
+    for size in map(parse_size, args.sizes):
+        case_queries = queries
+        if size:
+            case_queries = random.Random(args.seed).sample(queries, min(args.scaled_queries, len(queries)))
+        for engine in args.engines:
+            label = size or 'base'
+            print(f"- {engine} @ {label} ...", flush=True)
+            if engine == 'backend':
+                res = bench_backend(backend, case_queries, size, args)
+                res.update(engine='chatbot_backend.find_best_match',
+                           mode='embedding' if backend.engine.uses_embeddings else 'fallback')
+            else:
+                rows = synthetic_rows(seed_rows, size, args.seed)
+                res = bench_student(app, case_queries, rows, engine, args)
+                res.update(engine='StudentChatbot.find_best_match', mode=engine)
+            res['size'] = label
+            results.append(res)
+            if 'skipped' not in res:
+                print(f"  {res['throughput_qps']} q/s, p50 {res['latency_ms']['p50']} ms, "
+                      f"p99 {res['latency_ms']['p99']} ms, top1 {res['top1_accuracy']}")
+            else:
+                print(f"  skipped: {res['skipped']}")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'ai_available': bool(app.AI_AVAILABLE and app.bot.model is not None),
+            'cache': args.cache,
+            'query_count': len(queries),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
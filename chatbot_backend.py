@@ -1,8 +1,7 @@
-import yaml
-import re
-from flask import Flask, request, jsonify
-from difflib import SequenceMatcher
 import re
+from flask import Flask, request, jsonify, Response
+from matcher import MatchEngine, load_model
+from payloads import build_answer_payloads
 
 
 def markdown_like_to_html(text: str) -> str:
@@ -67,37 +66,33 @@ def markdown_like_to_html(text: str) -> str:
 
 app = Flask(__name__)
 
-# Load FAQ data from YAML
-with open('college_faq.yml', 'r', encoding='utf-8') as f:
-    faq_data = yaml.safe_load(f)
+# Load FAQ data from YAML and build the shared matching engine once
+engine = MatchEngine.from_yaml('college_faq.yml', load_model())
+
+FALLBACK_ANSWER = "Sorry, I couldn't find an exact answer. Please try rephrasing or ask about admissions, fees, courses, or contact."
+
+# Answers rendered to HTML and serialised/compressed once (see payloads.py)
+payloads = build_answer_payloads(engine.rows, markdown_like_to_html, extra={None: FALLBACK_ANSWER})
+
+
+def find_payload(user_query):
+    match, score, _emb = engine.match(user_query)
+    if match and score >= engine.threshold():
+        return payloads[match[0]]
+    return payloads[None]
 
-# Preprocess questions for matching
-faq_list = faq_data if isinstance(faq_data, list) else faq_data.get('faqs', [])
-questions = [item['question'] for item in faq_list]
 
-# Fuzzy match function
 def find_best_match(user_query):
-    user_query = user_query.lower().strip()
-    best_score = 0.0
-    best_idx = None
-    for idx, q in enumerate(questions):
-        score = SequenceMatcher(None, user_query, q.lower()).ratio()
-        if score > best_score:
-            best_score = score
-            best_idx = idx
-    if best_score > 0.55 and best_idx is not None:
-        # Convert to HTML before returning so frontend can render rich text
-        raw = faq_list[best_idx].get('answer', '')
-        return markdown_like_to_html(raw)
-
-    return "Sorry, I couldn't find an exact answer. Please try rephrasing or ask about admissions, fees, courses, or contact."
+    """Return the matched answer as HTML so the frontend can render rich text."""
+    return find_payload(user_query).html
 
 @app.route('/chat', methods=['POST'])
 def chat():
     data = request.get_json(force=True)
     user_msg = (data.get('message') or '').strip()
-    answer = find_best_match(user_msg)
-    return jsonify({'response': answer})
+    payload = find_payload(user_msg)
+    body, headers = payload.select(request.headers.get('Accept-Encoding'))
+    return Response(body, headers=headers)
 
 @app.route('/health')
 def health():
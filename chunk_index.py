@@ -0,0 +1,85 @@
+"""Keyword search over the crawled website/PDF chunks.
+
+``data/main.py`` writes ``amjc_chunks.jsonl`` (1000-char pieces of every page
+and PDF). ``ChunkIndex`` loads it once into an inverted index and ranks chunks
+with BM25, which is used to attach supplementary snippets to chat answers.
+"""
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+
+CHUNKS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'amjc_data', 'amjc_chunks.jsonl')
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+class ChunkIndex:
+    def __init__(self, path=CHUNKS_PATH, stop_words=(), k1=1.5, b=0.75):
+        self.stop_words = set(stop_words)
+        self.k1 = k1
+        self.b = b
+        self.chunks = []
+        self.postings = defaultdict(list)  # token -> [(chunk_idx, term_freq)]
+        self.doc_len = []
+        self.idf = {}
+        if os.path.exists(path):
+            self.load(path)
+
+    def tokenize(self, text: str):
+        return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in self.stop_words]
+
+    def load(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                idx = len(self.chunks)
+                self.chunks.append((row.get('title', ''), row.get('url', ''), row.get('content', '')))
+                counts = Counter(self.tokenize(row.get('title', '') + ' ' + row.get('content', '')))
+                self.doc_len.append(sum(counts.values()))
+                for token, tf in counts.items():
+                    self.postings[token].append((idx, tf))
+
+        n = len(self.chunks)
+        self.avg_len = (sum(self.doc_len) / n) if n else 0.0
+        self.idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self.postings.items()}
+
+    def search(self, query: str, k=3, snippet_chars=240):
+        """Return up to ``k`` best chunks (one per URL) as dicts with title, url and snippet."""
+        terms = set(self.tokenize(query))
+        if not terms or not self.chunks:
+            return []
+        scores = defaultdict(float)
+        for term in terms:
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for idx, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[idx] / self.avg_len)
+                scores[idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        results = []
+        seen_urls = set()
+        for idx, score in sorted(scores.items(), key=lambda kv: kv[1], reverse=True):
+            title, url, content = self.chunks[idx]
+            if url in seen_urls:
+                continue
+            seen_urls.add(url)
+            results.append({'title': title, 'url': url, 'snippet': self.snippet(content, terms, snippet_chars),
+                            'score': round(score, 3)})
+            if len(results) >= k:
+                break
+        return results
+
+    def snippet(self, content: str, terms, size):
+        """Cut a ``size``-char window of ``content`` starting near the first query term."""
+        text = re.sub(r'\s+', ' ', content).strip()
+        lowered = text.lower()
+        positions = [p for p in (lowered.find(t) for t in terms) if p >= 0]
+        start = max(min(positions) - size // 4, 0) if positions else 0
+        piece = text[start:start + size].strip()
+        return ('…' if start else '') + piece + ('…' if start + size < len(text) else '')
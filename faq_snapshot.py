@@ -0,0 +1,228 @@
+"""Versioned FAQ snapshots: bulk import/export for the ``faqs`` table.
+
+Snapshot format (JSON or YAML)::
+
+    format: 1
+    version: <sha1 of the FAQ content>
+    faqs:
+      - question: ...
+        answer: ...
+        category: ...
+        keywords: ...
+
+``college_faq.yml`` (entries with a slug ``id`` instead of ``category``) and
+bare lists of FAQs are accepted as input as well.
+
+Imports upsert by question text in a single transaction. ``seed_faqs`` records
+the version of the seed it applied, so startup only writes to the database
+when the seed content actually changes.
+
+CLI:
+    python faq_snapshot.py export -o faqs.json
+    python faq_snapshot.py export --format yaml -o faqs.yml
+    python faq_snapshot.py import college_faq.yml
+    python faq_snapshot.py import faqs.json --replace
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+SNAPSHOT_FORMAT = 1
+FIELDS = ('question', 'answer', 'category', 'keywords')
+
+
+def normalize_faq(item):
+    return {
+        'question': (item.get('question') or '').strip(),
+        'answer': item.get('answer') or '',
+        'category': item.get('category') or item.get('id') or '',
+        'keywords': item.get('keywords') or '',
+    }
+
+
+def snapshot_version(faqs):
+    """Content hash of ``faqs``; identical content always yields the same version."""
+    canonical = json.dumps([normalize_faq(f) for f in faqs], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def make_snapshot(faqs):
+    faqs = [normalize_faq(f) for f in faqs]
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'version': snapshot_version(faqs),
+        'exported_at': datetime.now().isoformat(timespec='seconds'),
+        'faqs': faqs,
+    }
+
+
+def parse_snapshot(text, fmt='json'):
+    """Parse snapshot text and return the list of normalised FAQs."""
+    if fmt in ('yaml', 'yml'):
+        import yaml
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    items = data if isinstance(data, list) else (data or {}).get('faqs', [])
+    if isinstance(data, dict) and data.get('format', SNAPSHOT_FORMAT) > SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {data['format']}")
+    faqs = [normalize_faq(item) for item in items]
+    missing = [i for i, f in enumerate(faqs) if not f['question'] or not f['answer']]
+    if missing:
+        raise ValueError(f"FAQ entries without question/answer at positions {missing}")
+    return faqs
+
+
+def dump_snapshot(snapshot, fmt='json'):
+    if fmt in ('yaml', 'yml'):
+        import yaml
+        return yaml.safe_dump(snapshot, allow_unicode=True, sort_keys=False)
+    return json.dumps(snapshot, ensure_ascii=False, indent=2)
+
+
+def format_for_path(path):
+    return 'yaml' if os.path.splitext(path)[1].lower() in ('.yml', '.yaml') else 'json'
+
+
+def load_snapshot_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_snapshot(f.read(), format_for_path(path))
+
+
+def export_faqs(conn):
+    cur = conn.cursor()
+    cur.execute('SELECT question, answer, category, keywords FROM faqs ORDER BY id')
+    return make_snapshot([dict(zip(FIELDS, row)) for row in cur.fetchall()])
+
+
+def _upsert(cur, faqs, update_existing=True, replace=False):
+    """Upsert ``faqs`` by question using ``cur`` (inside the caller's transaction)."""
+    cur.execute('SELECT id, question, answer, category, keywords FROM faqs')
+    existing = {row[1]: row for row in cur.fetchall()}
+
+    inserts, updates, seen = [], [], set()
+    for f in faqs:
+        q = f['question']
+        if q in seen:
+            continue
+        seen.add(q)
+        row = existing.get(q)
+        if row is None:
+            inserts.append((q, f['answer'], f['category'], f['keywords']))
+        elif update_existing and (row[2], row[3] or '', row[4] or '') != (f['answer'], f['category'], f['keywords']):
+            updates.append((f['answer'], f['category'], f['keywords'], row[0]))
+
+    if inserts:
+        cur.executemany('INSERT INTO faqs (question, answer, category, keywords) VALUES (?, ?, ?, ?)', inserts)
+    if updates:
+        cur.executemany('UPDATE faqs SET answer=?, category=?, keywords=? WHERE id=?', updates)
+    deleted = [(row[0],) for q, row in existing.items() if q not in seen] if replace else []
+    if deleted:
+        cur.executemany('DELETE FROM faqs WHERE id=?', deleted)
+    return {
+        'inserted': len(inserts),
+        'updated': len(updates),
+        'unchanged': len(seen) - len(inserts) - len(updates),
+        'deleted': len(deleted),
+    }
+
+
+def import_faqs(conn, faqs, replace=False):
+    """Upsert ``faqs`` in one transaction; ``replace`` also deletes FAQs not in the snapshot."""
+    cur = conn.cursor()
+    cur.execute('BEGIN IMMEDIATE')
+    try:
+        counts = _upsert(cur, faqs, replace=replace)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return counts
+
+
+def seed_version(faqs, extra_data=None):
+    """Version of a seed: hash of ``faqs`` plus any JSON-serialisable ``extra_data``."""
+    version = snapshot_version(faqs)
+    if extra_data is None:
+        return version
+    canonical = json.dumps([version, extra_data], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def seed_faqs(conn, faqs, key='default_faqs', extra=None, extra_data=None):
+    """Insert missing seed FAQs once per seed version.
+
+    Existing rows are left alone (admin edits survive), matching the old
+    insert-if-missing seeding. ``extra(cur)`` runs in the same transaction
+    for one-off content fixes; pass the data it applies as ``extra_data`` so
+    changing a fix also changes the version. Returns False when the stored
+    version matches and nothing was written. Needs the ``snapshot_meta`` table
+    created by ``StudentChatbot.init_database``.
+    """
+    version = seed_version(faqs, extra_data)
+    cur = conn.cursor()
+    cur.execute('SELECT value FROM snapshot_meta WHERE key = ?', (key,))
+    row = cur.fetchone()
+    if row and row[0] == version:
+        return False
+
+    cur.execute('BEGIN IMMEDIATE')
+    try:
+        # another worker may have seeded while we waited for the write lock
+        cur.execute('SELECT value FROM snapshot_meta WHERE key = ?', (key,))
+        row = cur.fetchone()
+        if row and row[0] == version:
+            conn.rollback()
+            return False
+        _upsert(cur, [normalize_faq(f) for f in faqs], update_existing=False)
+        if extra:
+            extra(cur)
+        cur.execute('INSERT OR REPLACE INTO snapshot_meta (key, value) VALUES (?, ?)', (key, version))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return True
+
+
+def connect(db_path):
+    # autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+    return sqlite3.connect(db_path, isolation_level=None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import/export FAQ snapshots')
+    parser.add_argument('--db', default='chatbot.db', help='SQLite database (default: chatbot.db)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    exp = sub.add_parser('export', help='write all FAQs as a snapshot')
+    exp.add_argument('-o', '--output', help='output file (default: stdout)')
+    exp.add_argument('--format', choices=['json', 'yaml'], help='default: from the file extension, else json')
+    imp = sub.add_parser('import', help='upsert FAQs from a snapshot, college_faq.yml or a list of FAQs')
+    imp.add_argument('path')
+    imp.add_argument('--replace', action='store_true', help='delete FAQs that are not in the snapshot')
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        if args.command == 'export':
+            fmt = args.format or (format_for_path(args.output) if args.output else 'json')
+            text = dump_snapshot(export_faqs(conn), fmt)
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    f.write(text)
+            else:
+                sys.stdout.write(text + '\n')
+        else:
+            counts = import_faqs(conn, load_snapshot_file(args.path), replace=args.replace)
+            print(json.dumps(counts))
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
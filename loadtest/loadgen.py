@@ -0,0 +1,185 @@
+"""Async HTTP load generator for the chatbot Flask endpoints.
+
+Runs a scenario file (see ``loadtest/scenarios``) against a running server and
+reports throughput, error rate and latency percentiles per request type.
+
+Scenario format (JSON):
+    {
+      "name": "chat_mix",
+      "duration_s": 30,
+      "messages": ["fees", "How do I apply for admission?", ...],
+      "groups": [
+        {"name": "students", "concurrency": 32, "think_time_ms": 0,
+         "requests": [
+           {"name": "chat", "weight": 8, "method": "POST", "path": "/chat",
+            "json": {"message": "{message}"}}
+         ]}
+      ]
+    }
+
+Placeholders in paths and JSON string values: ``{message}`` (random entry of
+``messages``), ``{faq_id}`` (random id in ``faq_id_range``) and ``{n}`` (a
+per-run counter).
+
+Usage:
+    pip install -r loadtest/requirements.txt
+    python loadtest/loadgen.py --url http://127.0.0.1:8000 --scenario loadtest/scenarios/chat_mix.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+import aiohttp
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def load_scenario(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class Stats:
+    """Per-request-type latency and status bookkeeping."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, name, latency, status):
+        self.latencies[name].append(latency)
+        self.statuses[name][str(status)] += 1
+
+    def summary(self, elapsed):
+        report = {}
+        names = sorted(self.latencies)
+        for name in names + ['total']:
+            if name == 'total':
+                lat = sorted(x for n in names for x in self.latencies[n])
+                statuses = sum((self.statuses[n] for n in names), Counter())
+            else:
+                lat = sorted(self.latencies[name])
+                statuses = self.statuses[name]
+            count = len(lat)
+            errors = sum(v for k, v in statuses.items() if not (k.isdigit() and int(k) < 400))
+            ms = [x * 1000.0 for x in lat]
+            report[name] = {
+                'requests': count,
+                'throughput_rps': round(count / elapsed, 2) if elapsed else 0.0,
+                'errors': errors,
+                'error_rate': round(errors / count, 4) if count else 0.0,
+                'statuses': dict(statuses),
+                'latency_ms': {
+                    'p50': round(percentile(ms, 50), 2),
+                    'p90': round(percentile(ms, 90), 2),
+                    'p99': round(percentile(ms, 99), 2),
+                    'max': round(ms[-1], 2) if ms else 0.0,
+                },
+            }
+        return report
+
+
+def render(value, ctx):
+    """Substitute placeholders in strings nested inside ``value``."""
+    if isinstance(value, str):
+        return value.format(**ctx)
+    if isinstance(value, dict):
+        return {k: render(v, ctx) for k, v in value.items()}
+    if isinstance(value, list):
+        return [render(v, ctx) for v in value]
+    return value
+
+
+async def user_loop(session, base_url, scenario, group, deadline, stats, rng, counter):
+    requests = group['requests']
+    weights = [r.get('weight', 1) for r in requests]
+    think = group.get('think_time_ms', 0) / 1000.0
+    lo, hi = scenario.get('faq_id_range', [1, 20])
+    messages = scenario.get('messages') or ['hi']
+    while time.monotonic() < deadline:
+        step = rng.choices(requests, weights=weights)[0]
+        counter[0] += 1
+        ctx = {'message': rng.choice(messages), 'faq_id': rng.randint(lo, hi), 'n': counter[0]}
+        method = step.get('method', 'GET')
+        url = base_url + render(step['path'], ctx)
+        body = render(step['json'], ctx) if 'json' in step else None
+        t0 = time.perf_counter()
+        try:
+            async with session.request(method, url, json=body) as resp:
+                await resp.read()
+                status = resp.status
+        except asyncio.TimeoutError:
+            status = 'timeout'
+        except aiohttp.ClientError as e:
+            status = type(e).__name__
+        stats.record(step.get('name', step['path']), time.perf_counter() - t0, status)
+        if think:
+            await asyncio.sleep(think)
+
+
+async def run_scenario(base_url, scenario, duration=None, seed=0, timeout=30.0):
+    """Run ``scenario`` against ``base_url`` and return the summary report."""
+    duration = duration or scenario.get('duration_s', 30)
+    stats = Stats()
+    counter = [0]
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(timeout=client_timeout, connector=connector) as session:
+        start = time.monotonic()
+        deadline = start + duration
+        tasks = []
+        for g_idx, group in enumerate(scenario['groups']):
+            for u_idx in range(group.get('concurrency', 1)):
+                rng = random.Random(f'{seed}:{g_idx}:{u_idx}')
+                tasks.append(user_loop(session, base_url.rstrip('/'), scenario, group, deadline, stats, rng, counter))
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - start
+    return {
+        'scenario': scenario.get('name'),
+        'url': base_url,
+        'duration_s': round(elapsed, 2),
+        'concurrency': sum(g.get('concurrency', 1) for g in scenario['groups']),
+        'endpoints': stats.summary(elapsed),
+    }
+
+
+def print_report(report):
+    print(f"\nScenario {report['scenario']} against {report['url']} "
+          f"({report['concurrency']} users, {report['duration_s']} s)")
+    print(f"{'request':<16} {'count':>8} {'rps':>9} {'err%':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for name, r in report['endpoints'].items():
+        lat = r['latency_ms']
+        print(f"{name:<16} {r['requests']:>8} {r['throughput_rps']:>9} {r['error_rate'] * 100:>6.2f}% "
+              f"{lat['p50']:>9} {lat['p90']:>9} {lat['p99']:>9} {lat['max']:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Async load generator for the chatbot API')
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--scenario', required=True, help='scenario JSON file')
+    parser.add_argument('--duration', type=float, help='override the scenario duration (seconds)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_scenario(args.url, load_scenario(args.scenario), args.duration, args.seed))
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
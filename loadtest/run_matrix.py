@@ -0,0 +1,126 @@
+"""Run the load-test scenarios across gunicorn worker counts and Redis modes.
+
+For every combination of ``--workers`` and ``--redis`` this starts
+``gunicorn app:app`` in a fresh temporary directory (so each run gets its own
+``chatbot.db``), waits for ``/health``, replays each scenario with
+``loadgen.py`` and stops the server. The combined report is written as JSON.
+
+Redis modes:
+- ``none``: point REDIS_URL at a closed port so the app runs without a cache
+- ``fake``: ``REDIS_URL=fakeredis://`` — an in-process fakeredis per worker
+- ``url``:  use the real server given by ``--redis-url``
+
+Usage:
+    python loadtest/run_matrix.py --workers 1 4 16 --redis none fake --duration 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from loadgen import load_scenario, print_report, run_scenario  # noqa: E402
+
+DEFAULT_SCENARIOS = ['chat_mix.json', 'admin_edits.json', 'csv_export.json']
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def redis_url_for(mode, args):
+    if mode == 'none':
+        return 'redis://127.0.0.1:1/0'
+    if mode == 'fake':
+        return 'fakeredis://'
+    return args.redis_url
+
+
+def wait_healthy(url, proc, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with status {proc.returncode}')
+        try:
+            with urllib.request.urlopen(url + '/health', timeout=2) as resp:
+                if resp.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f'server at {url} did not become healthy within {timeout}s')
+
+
+def start_server(workers, threads, redis_url, workdir, port):
+    env = dict(os.environ, REDIS_URL=redis_url)
+    cmd = [sys.executable, '-m', 'gunicorn', 'app:app',
+           '--pythonpath', ROOT, '--workers', str(workers), '--threads', str(threads),
+           '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    log = open(os.path.join(workdir, 'gunicorn.log'), 'wb')
+    return subprocess.Popen(cmd, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT,
+                            start_new_session=True)
+
+
+def stop_server(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=30)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(proc.pid, signal.SIGKILL)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test matrix over gunicorn workers and Redis modes')
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 4, 16])
+    parser.add_argument('--threads', type=int, default=1, help='gunicorn threads per worker')
+    parser.add_argument('--redis', nargs='+', default=['none', 'fake'], choices=['none', 'fake', 'url'])
+    parser.add_argument('--redis-url', default='redis://localhost:6379/0', help="used with --redis url")
+    parser.add_argument('--scenarios', nargs='+', default=[os.path.join(HERE, 'scenarios', s) for s in DEFAULT_SCENARIOS])
+    parser.add_argument('--duration', type=float, help='override each scenario duration (seconds)')
+    parser.add_argument('--startup-timeout', type=float, default=180,
+                        help='seconds to wait for workers to boot (model loading is slow)')
+    parser.add_argument('--output', default='loadtest_results.json')
+    args = parser.parse_args(argv)
+
+    scenarios = [load_scenario(p) for p in args.scenarios]
+    runs = []
+    for mode in args.redis:
+        for workers in args.workers:
+            workdir = tempfile.mkdtemp(prefix=f'amjc-load-w{workers}-{mode}-')
+            port = free_port()
+            url = f'http://127.0.0.1:{port}'
+            print(f'\n=== {workers} worker(s), redis={mode} ({workdir}) ===', flush=True)
+            proc = start_server(workers, args.threads, redis_url_for(mode, args), workdir, port)
+            try:
+                wait_healthy(url, proc, args.startup_timeout)
+                for scenario in scenarios:
+                    report = asyncio.run(run_scenario(url, scenario, args.duration))
+                    report.update(workers=workers, threads=args.threads, redis=mode)
+                    print_report(report)
+                    runs.append(report)
+            except RuntimeError as e:
+                print(f'  run failed: {e}')
+                runs.append({'workers': workers, 'threads': args.threads, 'redis': mode, 'error': str(e)})
+            finally:
+                stop_server(proc)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'runs': runs}, f, indent=2)
+    print(f'\nCombined report written to {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,17 @@
+"""Shared FAQ matching engine for app.py and chatbot_backend.py."""
+from .engine import AI_AVAILABLE, DEFAULT_MODEL, MatchEngine, load_model
+from .loaders import load_faqs_from_sqlite, load_faqs_from_yaml
+from .text import preprocess, apply_synonyms, is_follow_up, stop_words
+
+__all__ = [
+    'AI_AVAILABLE',
+    'DEFAULT_MODEL',
+    'MatchEngine',
+    'load_model',
+    'load_faqs_from_sqlite',
+    'load_faqs_from_yaml',
+    'preprocess',
+    'apply_synonyms',
+    'is_follow_up',
+    'stop_words',
+]
@@ -0,0 +1,268 @@
+"""FAQ matching engine used by both app.py and chatbot_backend.py.
+
+A ``MatchEngine`` is built once per knowledge-base version: the constructor
+precomputes the keyword/fuzzy index, per-category candidate lists and (when
+sentence-transformers is installed) normalised FAQ embeddings. Instances are
+never mutated afterwards, so reloading means building a new engine and
+swapping the reference, which is safe while other threads are matching.
+"""
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+
+from .loaders import load_faqs_from_sqlite, load_faqs_from_yaml
+from .text import preprocess, apply_synonyms, is_follow_up
+
+# Optional AI embeddings
+AI_AVAILABLE = False
+try:
+    from sentence_transformers import SentenceTransformer, util
+    AI_AVAILABLE = True
+except Exception as e:
+    print(f"AI packages unavailable or failed to load: {e}")
+    AI_AVAILABLE = False
+
+DEFAULT_MODEL = 'all-MiniLM-L6-v2'
+FOLLOW_UP_BIAS = 0.3
+# An in-category follow-up result must score within this of the global best
+FOLLOW_UP_MARGIN = 0.05
+
+
+def load_model(name=DEFAULT_MODEL):
+    """Load the sentence-transformers model, or return None if unavailable."""
+    if not AI_AVAILABLE:
+        return None
+    try:
+        model = SentenceTransformer(name)
+        print("✓ Embedding model loaded")
+        return model
+    except Exception as e:
+        print(f"⚠ Could not load embedding model: {e}")
+        return None
+
+
+class MatchEngine:
+    def __init__(self, rows, model=None, cache_size=4096):
+        # rows: (id, question, answer, category, keywords)
+        self.rows = list(rows)
+        self.model = model
+
+        # Fallback index: (tokens, synonym-normalised text, token set) per FAQ row.
+        # This also loads the WordNet lemmatizer data up front.
+        self.faq_index = []
+        for _id, q, a, c, k in self.rows:
+            q_tokens = preprocess(q + ' ' + (k or ''))
+            self.faq_index.append((q_tokens, apply_synonyms(' '.join(q_tokens)), frozenset(q_tokens)))
+
+        # Row lookup and per-category candidate lists for session follow-ups
+        self.row_by_id = {row[0]: row for row in self.rows}
+        self.category_index = {}
+        for i, row in enumerate(self.rows):
+            if row[3]:
+                self.category_index.setdefault(row[3], []).append(i)
+
+        self.faq_embeddings = None
+        if AI_AVAILABLE and self.model and self.rows:
+            try:
+                texts = [q + ' ' + (k or '') for _id, q, a, c, k in self.rows]
+                # stored normalised so matching is a single dot product per query
+                self.faq_embeddings = self.model.encode(texts, convert_to_tensor=True, normalize_embeddings=True)
+                print(f"✓ Created embeddings for {len(texts)} FAQs")
+            except Exception as e:
+                print(f"⚠ Embeddings disabled due to error: {e}")
+                self.faq_embeddings = None
+
+        # Per-category embedding slices, so follow-ups score only their category
+        self.category_embeddings = {}
+        if self.faq_embeddings is not None:
+            for category, indices in self.category_index.items():
+                self.category_embeddings[category] = self.faq_embeddings[indices]
+
+        # Context-free results keyed by normalised query text
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def from_sqlite(cls, db_path='chatbot.db', model=None, **kwargs):
+        return cls(load_faqs_from_sqlite(db_path), model, **kwargs)
+
+    @classmethod
+    def from_yaml(cls, path='college_faq.yml', model=None, **kwargs):
+        return cls(load_faqs_from_yaml(path), model, **kwargs)
+
+    @property
+    def uses_embeddings(self):
+        return self.faq_embeddings is not None
+
+    def threshold(self):
+        return 0.40 if self.uses_embeddings else 0.48
+
+    def is_follow_up(self, user_message: str):
+        return is_follow_up(user_message)
+
+    @staticmethod
+    def normalize(user_message: str):
+        return apply_synonyms(user_message.strip())
+
+    # -- cache -------------------------------------------------------------
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+            return hit
+
+    def _cache_put(self, key, value):
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # -- matching ----------------------------------------------------------
+
+    def match(self, user_message: str, context=None):
+        """Return ``(row, score, query_embedding)`` for ``user_message``.
+
+        ``query_embedding`` is a tensor in embedding mode and None otherwise.
+
+        When ``context`` (see session_store.py) has an active category and the
+        message looks like a follow-up, the FAQs in that category are rescored
+        with the previous query embedding biasing the current one. The category
+        result is used only if it clears the threshold and scores within
+        ``FOLLOW_UP_MARGIN`` of the best match over the whole knowledge base, so
+        a short new question is not pinned to the previous topic.
+        """
+        user_text = self.normalize(user_message)
+        if not user_text:
+            return None, 0.0, None
+
+        result = self._cache_get(user_text)
+        if result is None:
+            result = self._match(user_text)
+            self._cache_put(user_text, result)
+
+        category = context.get('category') if context else None
+        if category and category in self.category_index and self.is_follow_up(user_message):
+            follow_up = self._follow_up_match(user_text, result, category, context.get('embedding'))
+            if follow_up is not None:
+                match, score, _emb = follow_up
+                if match and score >= self.threshold() and score >= result[1] - FOLLOW_UP_MARGIN:
+                    return follow_up
+        return result
+
+    def _follow_up_match(self, user_text, result, category, previous_embedding=None):
+        """Best match within ``category``, reusing the work already done for ``result``.
+
+        Returns None when ``result`` already is the in-category answer.
+        """
+        row, _score, emb = result
+        candidates = self.category_index[category]
+        if emb is not None and category in self.category_embeddings:
+            # reuse the query embedding; only the category's rows are scored
+            query = emb.unsqueeze(0)
+            if previous_embedding:
+                query = util.normalize_embeddings(query + FOLLOW_UP_BIAS * query.new_tensor([previous_embedding]))
+            sims = util.dot_score(query, self.category_embeddings[category])[0]
+            best = int(sims.argmax())
+            return self.rows[candidates[best]], float(sims[best]), emb
+        # keyword scores are unbiased: the global best, if in the category, is also its best
+        if row is not None and row[3] == category:
+            return None
+        return self._keyword_match(user_text, candidates)
+
+    def match_many(self, queries):
+        """Match a batch of queries; returns ``[(row, score), ...]`` in input order.
+
+        Duplicate and cached queries are resolved once, and in embedding mode
+        the remaining queries are encoded and scored in a single batch.
+        """
+        results = [(None, 0.0)] * len(queries)
+        pending = OrderedDict()  # normalised text -> positions in ``queries``
+        for i, q in enumerate(queries):
+            user_text = self.normalize(q or '')
+            if not user_text:
+                continue
+            cached = self._cache_get(user_text)
+            if cached is not None:
+                results[i] = cached[:2]
+            else:
+                pending.setdefault(user_text, []).append(i)
+
+        texts = list(pending)
+        if not texts:
+            return results
+
+        matched = None
+        if AI_AVAILABLE and self.model and self.faq_embeddings is not None:
+            try:
+                embs = self.model.encode(texts, convert_to_tensor=True, normalize_embeddings=True)
+                sims = util.dot_score(embs, self.faq_embeddings)
+                best = sims.argmax(dim=1)
+                matched = []
+                for j in range(len(texts)):
+                    idx = int(best[j])
+                    matched.append((self.rows[idx], float(sims[j, idx]), embs[j]))
+            except Exception as e:
+                print(f"⚠ Embedding batch match failed: {e}")
+                matched = None
+        if matched is None:
+            matched = [self._keyword_match(t) for t in texts]
+
+        for text, result in zip(texts, matched):
+            self._cache_put(text, result)
+            for i in pending[text]:
+                results[i] = result[:2]
+        return results
+
+    def _match(self, user_text):
+        # Try embeddings first
+        if AI_AVAILABLE and self.model and self.faq_embeddings is not None:
+            try:
+                emb = self.model.encode([user_text], convert_to_tensor=True, normalize_embeddings=True)
+                sims = util.dot_score(emb, self.faq_embeddings)[0]
+                best_idx = int(sims.argmax())
+                return self.rows[best_idx], float(sims[best_idx]), emb[0]
+            except Exception as e:
+                print(f"⚠ Embedding match failed: {e}")
+
+        return self._keyword_match(user_text)
+
+    def _keyword_match(self, user_text, candidates=None):
+        """Keyword/fuzzy fallback.
+
+        score = 0.4 * token overlap + 0.2 * (any query token longer than three
+        characters occurs in the FAQ text) + 0.6 * ``SequenceMatcher.ratio()``,
+        capped at 1.0.
+
+        ``SequenceMatcher.ratio()`` dominates the cost, so the query side is
+        analysed once and rows whose upper bound (``real_quick_ratio`` /
+        ``quick_ratio``) cannot beat the current best are skipped.
+        """
+        u_tokens = preprocess(user_text)
+        u_text = ' '.join(u_tokens)
+        u_set = set(u_tokens)
+        long_tokens = [t for t in u_tokens if len(t) > 3]
+        sm = SequenceMatcher(None, '', u_text)
+        best = None
+        best_score = 0.0
+        for i in (candidates if candidates is not None else range(len(self.rows))):
+            # q_text already includes FAQ synonyms
+            _q_tokens, q_text, q_set = self.faq_index[i]
+            base = len(q_set & u_set) * 0.4 + (1 if any(t in q_text for t in long_tokens) else 0) * 0.2
+            if min(base + 0.6, 1.0) <= best_score:
+                continue
+            sm.set_seq1(q_text)
+            if min(base + sm.real_quick_ratio() * 0.6, 1.0) <= best_score:
+                continue
+            if min(base + sm.quick_ratio() * 0.6, 1.0) <= best_score:
+                continue
+            score = min(base + sm.ratio() * 0.6, 1.0)
+            if score > best_score:
+                best_score = score
+                best = self.rows[i]
+        return best, best_score, None
@@ -0,0 +1,38 @@
+"""Load FAQ rows from the SQLite database or a YAML file.
+
+Both loaders return rows shaped like the ``faqs`` table:
+``(id, question, answer, category, keywords)``.
+"""
+import sqlite3
+
+
+def load_faqs_from_sqlite(db_path='chatbot.db'):
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    cur.execute('SELECT id, question, answer, category, keywords FROM faqs')
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def load_faqs_from_yaml(path='college_faq.yml'):
+    """Read ``college_faq.yml``-style files (a list, or a mapping with a ``faqs`` list).
+
+    YAML entries carry a slug ``id`` (e.g. ``fees``); rows get a 1-based
+    numeric id and the slug doubles as the category unless one is given.
+    """
+    import yaml
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f) or []
+    items = data if isinstance(data, list) else data.get('faqs', [])
+    rows = []
+    for i, item in enumerate(items, start=1):
+        rows.append((
+            i,
+            item['question'],
+            item.get('answer', ''),
+            item.get('category') or item.get('id') or '',
+            item.get('keywords', ''),
+        ))
+    return rows
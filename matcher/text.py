@@ -0,0 +1,52 @@
+"""Text normalisation and keyword/fuzzy scoring shared by the matching engine."""
+import re
+
+import nltk
+from nltk.tokenize import word_tokenize
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+
+# NLTK setup
+for pkg, path in [("punkt", 'tokenizers/punkt'), ("stopwords", 'corpora/stopwords'), ("wordnet", 'corpora/wordnet')]:
+    try:
+        nltk.data.find(path)
+    except LookupError:
+        nltk.download(pkg)
+
+lemmatizer = WordNetLemmatizer()
+stop_words = set(stopwords.words('english'))
+
+# simple synonyms mapping to broaden matching
+SYNONYMS = {
+    'fee': 'fees',
+    'tuition': 'fees',
+    'placement': 'placements',
+    'salary': 'placements',
+    'admission': 'admissions',
+    'apply': 'admissions'
+}
+
+# Session follow-ups ("what about M.Com?") are matched within the active category
+FOLLOW_UP_PREFIXES = ('what about', 'how about', 'what of', 'and ', 'also ', 'same for')
+FOLLOW_UP_MAX_TOKENS = 3
+
+
+def preprocess(text: str):
+    text = text.lower()
+    text = re.sub(r'[^a-z0-9\s]', ' ', text)
+    tokens = [lemmatizer.lemmatize(t) for t in word_tokenize(text) if t not in stop_words]
+    return tokens
+
+
+def apply_synonyms(text: str):
+    words = text.split()
+    words = [SYNONYMS.get(w, w) for w in words]
+    return ' '.join(words)
+
+
+def is_follow_up(user_message: str):
+    """Heuristic: short or elliptical messages ("what about M.Com?") continue the previous topic."""
+    text = user_message.strip().lower()
+    if text.startswith(FOLLOW_UP_PREFIXES):
+        return True
+    return len(preprocess(text)) <= FOLLOW_UP_MAX_TOKENS
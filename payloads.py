@@ -0,0 +1,127 @@
+"""Precomputed HTTP response payloads for FAQ answers.
+
+When the knowledge base loads, every answer is rendered to HTML once and
+serialised to the ``/chat`` JSON body, together with gzip (and, when the
+``brotli`` package is installed, br) compressed variants and an ETag per
+variant, plus the ready-made ``answer`` event for ``/chat/stream``. Serving an
+answer is then a dictionary lookup plus a write: ``Payload.select`` picks the
+variant allowed by ``Accept-Encoding``. Streamed events are not compressed.
+
+Payloads are immutable; rebuilding reuses the previous payload of every
+answer whose rendered HTML did not change, so admin edits only recompress
+the edited answers.
+"""
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+
+# Optional brotli support
+BROTLI_AVAILABLE = False
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except Exception:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# Server preference among encodings the client rates equally
+ENCODINGS = ('br', 'gzip')
+# Bodies below this size are not worth compressing
+MIN_COMPRESS_SIZE = 256
+CONTENT_TYPE = 'application/json; charset=utf-8'
+
+
+@lru_cache(maxsize=256)
+def accepted_encodings(accept_encoding):
+    """Encodings from ``ENCODINGS`` the client accepts, best first.
+
+    Handles q-values (``gzip;q=0.5``), refusals (``br;q=0``) and ``*``.
+    Header values repeat across clients, so results are memoised.
+    """
+    qvalues = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.partition(';')
+        name = name.strip()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qvalues[name] = q
+    star = qvalues.get('*', 0.0)
+    ranked = [(qvalues.get(enc, star), i, enc) for i, enc in enumerate(ENCODINGS)]
+    return tuple(enc for q, i, enc in sorted(ranked, key=lambda r: (-r[0], r[1])) if q > 0)
+
+
+class Payload:
+    """One serialised JSON response and its compressed variants."""
+    __slots__ = ('html', 'variants', 'answer_event')
+
+    def __init__(self, data, html='', gzip_level=9, brotli_quality=11):
+        self.html = html
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        # same data as the /chat body, framed as a server-sent event
+        self.answer_event = f"event: answer\ndata: {text}\n\n"
+        body = text.encode('utf-8')
+        digest = hashlib.sha1(body).hexdigest()[:20]
+        encoded = {None: body}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            encoded['gzip'] = gzip.compress(body, gzip_level, mtime=0)
+            if BROTLI_AVAILABLE:
+                encoded['br'] = brotli.compress(body, quality=brotli_quality)
+        # encoding -> (body, headers); variants get distinct ETags (informational:
+        # the payload routes are POSTs, so there are no conditional requests)
+        self.variants = {}
+        for encoding, content in encoded.items():
+            if encoding is not None and len(content) >= len(body):
+                continue
+            headers = {
+                'Content-Type': CONTENT_TYPE,
+                'ETag': f'"{digest}-{encoding}"' if encoding else f'"{digest}"',
+                'Vary': 'Accept-Encoding',
+            }
+            if encoding:
+                headers['Content-Encoding'] = encoding
+            self.variants[encoding] = (content, headers)
+
+    @classmethod
+    def dynamic(cls, data, html=''):
+        """Payload for a one-off response (e.g. a translation): cheaper compression levels."""
+        return cls(data, html, gzip_level=6, brotli_quality=4)
+
+    def select(self, accept_encoding=None):
+        """Return ``(body, headers)`` for the best variant the client accepts."""
+        if accept_encoding:
+            for encoding in accepted_encodings(accept_encoding):
+                variant = self.variants.get(encoding)
+                if variant is not None:
+                    return variant
+        return self.variants[None]
+
+    def __len__(self):
+        return len(self.variants[None][0])
+
+
+def build_answer_payloads(rows, render=None, previous=None, extra=None):
+    """Build ``{faq_id: Payload}`` for ``(id, question, answer, category, keywords)`` rows.
+
+    ``render`` turns a stored answer into HTML (default: stored as HTML
+    already). Payloads in ``previous`` are reused when the HTML is unchanged.
+    ``extra`` maps further keys (e.g. None for the fallback answer) to HTML.
+    """
+    previous = previous or {}
+    items = [(row[0], render(row[2]) if render else row[2]) for row in rows]
+    items.extend((extra or {}).items())
+    payloads = {}
+    for faq_id, html in items:
+        old = previous.get(faq_id)
+        if old is not None and old.html == html:
+            payloads[faq_id] = old
+        else:
+            payloads[faq_id] = Payload({'response': html, 'faq_id': faq_id}, html)
+    return payloads
@@ -0,0 +1,70 @@
+"""Per-client conversation context for multi-turn follow-ups.
+
+Each chat client sends a ``session_id``. For every session the bot remembers
+the last matched FAQ, its category and the query embedding (when embeddings
+are enabled), so a follow-up such as "what about M.Com?" can be matched within
+the active category.
+
+Contexts live in Redis when it is available, which shares them across
+gunicorn workers. Otherwise they are kept in a bounded in-process LRU. Both
+expire after ``ttl`` seconds of inactivity.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+MAX_SESSION_ID_LENGTH = 128
+
+
+class SessionStore:
+    def __init__(self, redis_client=None, max_sessions=10000, ttl=1800, prefix='session:'):
+        self.redis = redis_client
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.prefix = prefix
+        self._local = OrderedDict()  # session_id -> (expires_at, context)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def valid_id(session_id):
+        return isinstance(session_id, str) and 0 < len(session_id) <= MAX_SESSION_ID_LENGTH
+
+    def get(self, session_id):
+        """Return a copy of the stored context for ``session_id`` (empty dict if none)."""
+        if not self.valid_id(session_id):
+            return {}
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(self.prefix + session_id)
+                return json.loads(raw) if raw else {}
+            except Exception:
+                pass  # fall through to the in-process store
+        with self._lock:
+            entry = self._local.get(session_id)
+            if entry is None:
+                return {}
+            expires_at, context = entry
+            if expires_at < time.monotonic():
+                del self._local[session_id]
+                return {}
+            self._local.move_to_end(session_id)
+            return dict(context)
+
+    def set(self, session_id, context):
+        if not self.valid_id(session_id):
+            return
+        if self.redis is not None:
+            try:
+                self.redis.set(self.prefix + session_id, json.dumps(context), ex=self.ttl)
+                return
+            except Exception:
+                pass
+        with self._lock:
+            self._local[session_id] = (time.monotonic() + self.ttl, dict(context))
+            self._local.move_to_end(session_id)
+            while len(self._local) > self.max_sessions:
+                self._local.popitem(last=False)
+
+    def __len__(self):
+        return len(self._local)
@@ -5,6 +5,8 @@ class StudentChatbot {
     this.messageInput = document.getElementById('user-input');
     this.sendButton = document.getElementById('send-btn');
     this.chatMessages = document.getElementById('chat-body');
+        // Lets the backend resolve follow-ups ("what about M.Com?") against the previous answer
+        this.sessionId = this.loadSessionId();
         
         this.initializeEventListeners();
         this.setWelcomeTime();
@@ -31,6 +33,21 @@ class StudentChatbot {
         });
     }
     
+    loadSessionId() {
+        const key = 'amjc-chat-session';
+        try {
+            let id = sessionStorage.getItem(key);
+            if (!id) {
+                id = (window.crypto && crypto.randomUUID) ? crypto.randomUUID()
+                    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+                sessionStorage.setItem(key, id);
+            }
+            return id;
+        } catch (e) {
+            return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+        }
+    }
+    
     setWelcomeTime() {
         const welcomeTimeElement = document.getElementById('welcomeTime');
         if (welcomeTimeElement) {
@@ -56,32 +73,11 @@ class StudentChatbot {
         this.messageInput.value = '';
         
         try {
-            // Send message to backend
-            const response = await fetch('/chat', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ message: message })
-            });
-            
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            
-            const data = await response.json();
-            
-            // Add bot response immediately; data may include faq_id
-            this.addMessage(data.response, 'bot');
-            if (data.faq_id) {
-                // attach vote handlers (example)
-                // (message container is last child)
-                const last = this.chatMessages.lastElementChild;
-                const voteBtns = last.querySelectorAll('.vote-btn');
-                if (voteBtns.length === 2) {
-                    voteBtns[0].addEventListener('click', ()=> postVote(data.faq_id, true));
-                    voteBtns[1].addEventListener('click', ()=> postVote(data.faq_id, false));
-                }
+            // Prefer the streaming endpoint: the answer renders as soon as it is
+            // matched, translation and related snippets follow as SSE events.
+            const streamed = await this.streamMessage(message);
+            if (!streamed) {
+                await this.fetchMessage(message);
             }
             this.setInputState(true);
             
@@ -95,6 +91,117 @@ class StudentChatbot {
         }
     }
     
+    async fetchMessage(message) {
+        // Send message to backend
+        const response = await fetch('/chat', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ message: message, session_id: this.sessionId })
+        });
+        
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        
+        const data = await response.json();
+        
+        // Add bot response immediately; data may include faq_id
+        const messageDiv = this.addMessage(data.response, 'bot');
+        this.attachVoteHandlers(messageDiv, data.faq_id);
+    }
+    
+    async streamMessage(message) {
+        // Returns false when streaming is unavailable so the caller can fall back to /chat
+        if (!window.ReadableStream || !window.TextDecoder) return false;
+        
+        const response = await fetch('/chat/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream',
+            },
+            body: JSON.stringify({ message: message, session_id: this.sessionId })
+        });
+        if (!response.ok || !response.body) return false;
+        
+        let messageDiv = null;
+        await this.readEventStream(response, (event, data) => {
+            if (event === 'answer') {
+                messageDiv = this.addMessage(data.response, 'bot');
+                this.attachVoteHandlers(messageDiv, data.faq_id);
+            } else if (event === 'translation' && messageDiv) {
+                messageDiv.querySelector('.message-text').innerHTML = this.formatMessage(data.response);
+            } else if (event === 'snippets' && messageDiv) {
+                this.addSnippets(messageDiv, data.items || []);
+            }
+        });
+        return messageDiv !== null;
+    }
+    
+    async readEventStream(response, onEvent) {
+        // Minimal SSE parser for fetch() bodies (EventSource only supports GET)
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let sep;
+            while ((sep = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, sep);
+                buffer = buffer.slice(sep + 2);
+                let event = 'message';
+                const dataLines = [];
+                frame.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+                });
+                if (dataLines.length) onEvent(event, JSON.parse(dataLines.join('\n')));
+            }
+        }
+    }
+    
+    attachVoteHandlers(messageDiv, faqId) {
+        if (!faqId || !messageDiv) return;
+        const voteBtns = messageDiv.querySelectorAll('.vote-btn');
+        if (voteBtns.length === 2) {
+            voteBtns[0].addEventListener('click', ()=> postVote(faqId, true));
+            voteBtns[1].addEventListener('click', ()=> postVote(faqId, false));
+        }
+    }
+    
+    addSnippets(messageDiv, items) {
+        if (!items.length) return;
+        const wrapper = document.createElement('div');
+        wrapper.className = 'message-snippets';
+        const heading = document.createElement('div');
+        heading.className = 'message-snippets-title';
+        heading.textContent = 'Related from the college website';
+        wrapper.appendChild(heading);
+        items.forEach(item => {
+            // snippets are plain text from crawled pages, so never inject them as HTML
+            const link = document.createElement('a');
+            link.href = item.url;
+            link.target = '_blank';
+            link.rel = 'noopener';
+            link.textContent = item.title || item.url;
+            const text = document.createElement('div');
+            text.className = 'message-snippet-text';
+            text.textContent = item.snippet;
+            const entry = document.createElement('div');
+            entry.className = 'message-snippet';
+            entry.appendChild(link);
+            entry.appendChild(text);
+            wrapper.appendChild(entry);
+        });
+        const timeDiv = messageDiv.querySelector('.message-time');
+        timeDiv.parentElement.insertBefore(wrapper, timeDiv);
+        messageDiv.scrollIntoView({ behavior: 'smooth', block: 'end', inline: 'nearest' });
+    }
+    
     addMessage(text, sender) {
         const messageDiv = document.createElement('div');
         messageDiv.className = `message ${sender}-message`;
@@ -171,6 +278,7 @@ class StudentChatbot {
                 setTimeout(() => this.scrollToBottom(false), 350);
             }
         });
+        return messageDiv;
     }
     
     formatMessage(text) {